@@ -2,16 +2,20 @@
 from __future__ import annotations
 
 import argparse
-import json
+import contextlib
+import cProfile
 import os
+import pstats
 import subprocess
 import sys
 import time
+import tracemalloc
+from typing import Callable, Optional
 
 from xdsl.dialects.builtin import ModuleOp
 from xdsl.printer import Printer
 
-from step2_ast_to_dataclasses.c_ast import parse_ast, TranslationUnit, pretty_print_translation_unit
+from step2_ast_to_dataclasses.c_ast import parse_ast_file, FunctionDecl, TranslationUnit, pretty_print_function
 from step3_dataclasses_to_mlir.mlir_generator import MLIRGenerator
 from step4_mlir_to_quantum_mlir.quantum_mlir_generator import generate_quantum_mlir
 from step5_quantum_mlir_to_qasm.qasm_generator import generate_circuit, export_qasm, export_qasm_clifford_t
@@ -21,6 +25,50 @@ JSON_DIR = "json_out"
 MLIR_DIR = "mlir_out"
 QMLIR_DIR = "quantum_mlir_out"
 QASM_DIR = "output"
+PROFILE_DIR = "profile_out"
+
+
+class StageProfiler:
+    """Collect cProfile data, wall time and peak allocations per pipeline stage.
+
+    A single :class:`cProfile.Profile` is enabled only while a stage runs, so
+    the dumped statistics cover exactly the instrumented stages.  Peak memory
+    is measured with :mod:`tracemalloc`, which must be started by the caller.
+    """
+
+    def __init__(self) -> None:
+        self.profile = cProfile.Profile()
+        self.stages: list[tuple[str, float, int]] = []
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        self.profile.enable()
+        try:
+            yield
+        finally:
+            self.profile.disable()
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            self.stages.append((name, elapsed, peak))
+
+    def report(self, stats_path: str) -> None:
+        """Print the per-stage summary and dump the profile to ``stats_path``."""
+        os.makedirs(os.path.dirname(stats_path), exist_ok=True)
+        pstats.Stats(self.profile).dump_stats(stats_path)
+        print("\n=== Profile ===")
+        print(f"{'stage':<16}{'time [s]':>12}{'peak [MiB]':>14}")
+        for name, elapsed, peak in self.stages:
+            print(f"{name:<16}{elapsed:>12.3f}{peak / 2**20:>14.2f}")
+        print(f"cProfile stats written to {stats_path}")
+
+
+def _stage(profiler: Optional[StageProfiler], name: str):
+    """Return the profiling context for ``name`` or a no-op one."""
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.stage(name)
 
 
 def generate_json_ast(c_path: str) -> str:
@@ -36,11 +84,20 @@ def generate_json_ast(c_path: str) -> str:
     return json_path
 
 
-def generate_mlir(tu: TranslationUnit) -> ModuleOp:
+def generate_mlir(
+    tu: TranslationUnit, visit_function: Optional[Callable[[FunctionDecl], None]] = None
+) -> ModuleOp:
+    """Lower ``tu`` to a module, calling ``visit_function`` on each function first.
+
+    The hook lets other consumers of the AST (e.g. the pretty printer) share
+    the single walk over ``tu`` while each function is still hot in cache.
+    """
     generator = MLIRGenerator()
     module = ModuleOp([])
     block = module.body.blocks[0]
     for func in tu.decls:
+        if visit_function is not None:
+            visit_function(func)
         block.add_op(generator.generate_function(func))
     return module
 
@@ -52,36 +109,50 @@ def save_module(module: ModuleOp, path: str) -> None:
 
 
 def compile_c_file(
-    c_file: str, num_bits: int = 16, verbose: bool = False, pretty: bool = False, run: bool = False
+    c_file: str,
+    num_bits: int = 16,
+    verbose: bool = False,
+    pretty: bool = False,
+    run: bool = False,
+    profiler: Optional[StageProfiler] = None,
 ) -> str:
     base = os.path.splitext(os.path.basename(c_file))[0]
 
-    json_path = generate_json_ast(c_file)
-    with open(json_path) as f:
-        ast_json = json.load(f)
-    tu = parse_ast(ast_json)
+    with _stage(profiler, "clang"):
+        json_path = generate_json_ast(c_file)
+    with _stage(profiler, "parse"):
+        tu = parse_ast_file(json_path)
 
+    # Pretty printing and MLIR generation share one walk over the functions.
+    visit_function = None
     if pretty:
         print("=== Pretty Printed C Code ===")
-        print(pretty_print_translation_unit(tu))
+        visit_function = lambda func: print("\n".join(pretty_print_function(func)))
+
+    with _stage(profiler, "mlir"):
+        mlir_module = generate_mlir(tu, visit_function)
+
+    if pretty:
         print("================================")
 
-    mlir_module = generate_mlir(tu)
     classical_path = os.path.join(MLIR_DIR, f"{base}_classical.mlir")
     save_module(mlir_module, classical_path)
 
-    quantum_module = generate_quantum_mlir(mlir_module)
+    with _stage(profiler, "quantum_mlir"):
+        quantum_module = generate_quantum_mlir(mlir_module)
     quantum_path = os.path.join(QMLIR_DIR, f"{base}_quantum.mlir")
     save_module(quantum_module, quantum_path)
 
-    circuit = generate_circuit(quantum_module, num_bits=num_bits, verbose=verbose)
+    with _stage(profiler, "circuit"):
+        circuit = generate_circuit(quantum_module, num_bits=num_bits, verbose=verbose)
     qasm_path = os.path.join(QASM_DIR, f"{base}.qasm")
 
     # ✅ Use standard QASM if simulation is requested, otherwise export Clifford+T
-    if run:
-        export_qasm(circuit, qasm_path)
-    else:
-        export_qasm_clifford_t(circuit, qasm_path)
+    with _stage(profiler, "qasm"):
+        if run:
+            export_qasm(circuit, qasm_path)
+        else:
+            export_qasm_clifford_t(circuit, qasm_path)
 
     return qasm_path
 
@@ -94,24 +165,44 @@ def main() -> None:
     parser.add_argument("--verbose", action="store_true", help="Verbose output during circuit generation")
     parser.add_argument("--pretty", action="store_true", help="Print the parsed C code from the AST")
     parser.add_argument("--time", action="store_true", help="Print total compilation + simulation time")
+    parser.add_argument(
+        "--sim-method",
+        default="matrix_product_state",
+        help="AerSimulator method used by --run (e.g. statevector, automatic)",
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="Profile each pipeline stage (time, peak memory, cProfile stats)"
+    )
 
     args = parser.parse_args()
 
     start = time.time() if args.time else None
 
+    profiler = None
+    if args.profile:
+        tracemalloc.start()
+        profiler = StageProfiler()
+
     qasm_path = compile_c_file(
         args.c_file,
         num_bits=args.bits,
         verbose=args.verbose,
         pretty=args.pretty,
         run=args.run,
+        profiler=profiler,
     )
 
     if args.run:
         from qiskit import QuantumCircuit
         print(f"Running simulation for {qasm_path} ...")
-        qc = QuantumCircuit.from_qasm_file(qasm_path)
-        simulate(qc)
+        with _stage(profiler, "simulate"):
+            qc = QuantumCircuit.from_qasm_file(qasm_path)
+            simulate(qc, method=args.sim_method)
+
+    if profiler is not None:
+        base = os.path.splitext(os.path.basename(args.c_file))[0]
+        profiler.report(os.path.join(PROFILE_DIR, f"{base}.pstats"))
+        tracemalloc.stop()
 
     if args.time:
         elapsed = time.time() - start
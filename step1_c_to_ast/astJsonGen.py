@@ -9,8 +9,43 @@ inputs used by the rest of the project without having to remember the exact
 
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 
-def astJsonGen(input_dir: str = "c_code") -> None:
+
+def _is_up_to_date(c_file_path: str, json_output_path: str) -> bool:
+    """Return ``True`` if ``json_output_path`` is at least as new as the source."""
+    try:
+        return os.path.getmtime(json_output_path) >= os.path.getmtime(c_file_path)
+    except OSError:  # no JSON dump yet
+        return False
+
+
+def _run_clang(c_file_path: str, json_output_path: str) -> str:
+    """Dump the JSON AST of ``c_file_path`` into ``json_output_path``."""
+    # Invoke Clang directly (no shell in between) with stdout sent to a
+    # temporary file, moved into place only once Clang has succeeded, so a
+    # failed run never leaves a dump that would look up to date next time.
+    tmp_path = f"{json_output_path}.tmp"
+    try:
+        with open(tmp_path, "w") as out:
+            subprocess.run(
+                ["clang", "-Xclang", "-ast-dump=json", "-g", "-fsyntax-only", c_file_path],
+                stdout=out,
+                check=True,
+            )
+        os.replace(tmp_path, json_output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    # Verify that the output file was actually created.
+    if not os.path.isfile(json_output_path):
+        raise RuntimeError(f"Error: JSON output file {json_output_path} was not created.")
+    return json_output_path
+
+
+def astJsonGen(input_dir: str = "c_code", force: bool = False) -> None:
     """Generate JSON ASTs for every ``.c`` file in ``input_dir``.
 
     Parameters
@@ -19,6 +54,9 @@ def astJsonGen(input_dir: str = "c_code") -> None:
         Directory containing the C sources.  Each file in this directory is
         compiled with ``clang`` using the ``-ast-dump=json`` option and the
         resulting JSON is placed in a sibling ``json_out`` folder.
+    force:
+        Regenerate every dump.  By default a source whose JSON file is at
+        least as recent as the ``.c`` file is skipped.
     """
     # Save the current working directory so we can build paths relative to it.
     current_dir = os.getcwd()
@@ -40,19 +78,25 @@ def astJsonGen(input_dir: str = "c_code") -> None:
     # Create the output directory where the JSON files will be written.
     os.makedirs(json_out_folder, exist_ok=True)
 
-    # Iterate over all discovered C files and run Clang on each one.
+    # Pair every discovered C file with the JSON file it produces, skipping
+    # the ones whose dump is newer than the source.
+    c_file_paths = []
+    json_output_paths = []
     for c_file in c_files:
         c_file_path = os.path.join(c_code_folder, c_file)
         # Drop the ``.c`` extension to produce the JSON file name.
-        base_name = os.path.splitext(c_file)[0]
-        json_output_path = os.path.join(json_out_folder, f'{base_name}.json')
-
-        # Invoke Clang to emit the JSON AST into the designated file.
-        clang_ast_cmd_json = f'clang -Xclang -ast-dump=json -g -fsyntax-only {c_file_path} > {json_output_path}'
-        subprocess.run(clang_ast_cmd_json, shell=True, check=True)
+        json_output_path = os.path.join(json_out_folder, f'{os.path.splitext(c_file)[0]}.json')
+        if not force and _is_up_to_date(c_file_path, json_output_path):
+            print(f"JSON output up to date: {json_output_path}")
+            continue
+        c_file_paths.append(c_file_path)
+        json_output_paths.append(json_output_path)
 
-        # Verify that the output file was actually created.
-        if not os.path.isfile(json_output_path):
-            raise RuntimeError(f"Error: JSON output file {json_output_path} was not created.")
+    if not c_file_paths:
+        return
 
-        print(f"JSON output saved to: {json_output_path}")
+    # Each file is an independent clang process, so run them concurrently;
+    # threads are enough since the work happens in the child processes.
+    with ThreadPoolExecutor(max_workers=min(len(c_file_paths), os.cpu_count() or 1)) as pool:
+        for json_output_path in pool.map(_run_clang, c_file_paths, json_output_paths):
+            print(f"JSON output saved to: {json_output_path}")
@@ -12,34 +12,53 @@ the front-end logic separate from the MLIR generation and quantum translation
 stages.
 """
 
+import json
+import mmap
+import operator
+import sys
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Union
 
+try:
+    import ijson
+except Exception:  # pragma: no cover - optional dependency
+    ijson = None
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
 
 # -----------------------------------------------------------------------------
 # AST Classes
 # -----------------------------------------------------------------------------
 
 class Expression:
-    """Abstract base class for all expressions."""
-    pass
+    """Abstract base class for all expressions.
+
+    Expression nodes are by far the most numerous objects in a translation
+    unit, so they use ``__slots__``: no per-instance ``__dict__`` and a compact
+    fixed layout that keeps tree walks cache friendly.
+    """
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class IntegerLiteral(Expression):
     """Integer constant."""
 
     value: int
 
 
-@dataclass
+@dataclass(slots=True)
 class DeclRef(Expression):
     """Reference to a previously declared variable."""
 
     name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class BinaryOperator(Expression):
     """Binary operation between ``lhs`` and ``rhs``."""
 
@@ -48,7 +67,7 @@ class BinaryOperator(Expression):
     rhs: Expression
 
 
-@dataclass
+@dataclass(slots=True)
 class BinaryOperatorWithImmediate(Expression):
     """Binary operation where one side is an immediate."""
 
@@ -56,7 +75,7 @@ class BinaryOperatorWithImmediate(Expression):
     lhs: Expression
     rhs: Expression
 
-@dataclass
+@dataclass(slots=True)
 class UnaryOperator(Expression):
     """Unary operation like ``-x`` or ``x++``.
 
@@ -67,7 +86,7 @@ class UnaryOperator(Expression):
     operand: Expression
     is_postfix: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class VarDecl:
     """Variable declaration optionally with initialization."""
 
@@ -75,14 +94,14 @@ class VarDecl:
     init: Optional[Expression] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ReturnStmt:
     """Return statement with optional value."""
 
     value: Optional[Expression] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AssignStmt:
     """Assignment of ``value`` to variable ``name``."""
 
@@ -90,11 +109,11 @@ class AssignStmt:
     value: Expression
 
 
-@dataclass
+@dataclass(slots=True)
 class CompoundStmt:
     stmts: List[Union[VarDecl, ReturnStmt, AssignStmt, 'IfStmt']] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class FunctionDecl:
     """Function definition."""
 
@@ -103,19 +122,19 @@ class FunctionDecl:
     params: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class TranslationUnit:
     """Top-level container of all functions."""
 
     decls: List[FunctionDecl] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class IfStmt:
     condition: Expression
     then_body: CompoundStmt
     else_body: Optional[CompoundStmt] = None
 
-@dataclass
+@dataclass(slots=True)
 class ForStmt:
     init: Optional[Union[VarDecl, AssignStmt]]
     condition: Optional[Expression]
@@ -128,9 +147,172 @@ class ForStmt:
 # Expression Parsing
 # -----------------------------------------------------------------------------
 
+# Shared stand-in for a missing ``inner`` list; leaf nodes are common, and
+# ``node.get("inner", [])`` would allocate a fresh list for each of them.
+_NO_CHILDREN = ()
+
+
+def _wrap_i32(value: int) -> int:
+    """Reduce ``value`` to the signed 32-bit range, wrapping like ``int``."""
+    return ((value + 2**31) % 2**32) - 2**31
+
+
+def _c_div(lhs: int, rhs: int) -> int:
+    """Integer division truncating toward zero like C."""
+    quotient = abs(lhs) // abs(rhs)
+    return -quotient if (lhs < 0) != (rhs < 0) else quotient
+
+
+# Arithmetic operators evaluated at parse time when both operands are literals.
+_FOLD_BINARY = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": _c_div,
+}
+
+# Unary operators evaluated at parse time on literal operands.
+_FOLD_UNARY = {
+    "+": operator.pos,
+    "-": operator.neg,
+    "~": operator.invert,
+}
+
+
+# Operators whose immediate form accepts the constant on either side.
+_COMMUTATIVE_OPS = frozenset(("+", "*"))
+
+
+def _fold_binary(opcode: str, lhs: Expression, rhs: Expression) -> Optional[Expression]:
+    """Simplify ``lhs opcode rhs`` when the result is known at parse time.
+
+    Literal operands are evaluated and identities such as ``x + 0`` or
+    ``x * 1`` collapse to ``x``.  ``None`` is returned when nothing applies.
+    """
+    lhs_lit = isinstance(lhs, IntegerLiteral)
+    rhs_lit = isinstance(rhs, IntegerLiteral)
+
+    if lhs_lit and rhs_lit:
+        fold = _FOLD_BINARY.get(opcode)
+        if fold is None or (opcode == "/" and rhs.value == 0):
+            return None
+        # Folded values must still fit the ``i32`` constants emitted later.
+        return IntegerLiteral(_wrap_i32(fold(lhs.value, rhs.value)))
+
+    if rhs_lit:
+        if rhs.value == 0 and opcode in ("+", "-"):
+            return lhs
+        if rhs.value == 1 and opcode in ("*", "/"):
+            return lhs
+        # Only drop the other operand when it cannot carry a ``++``/``--``.
+        if rhs.value == 0 and opcode == "*" and isinstance(lhs, DeclRef):
+            return rhs
+    elif lhs_lit:
+        if lhs.value == 0 and opcode == "+":
+            return rhs
+        if lhs.value == 1 and opcode == "*":
+            return rhs
+        if lhs.value == 0 and opcode == "*" and isinstance(rhs, DeclRef):
+            return lhs
+    return None
+
+
+# Each handler receives the JSON node together with its already parsed
+# operands, which ``parse_expression`` builds bottom-up.
+
+def _parse_integer_literal(expr_node: Dict, operands: List[Expression]) -> Expression:
+    """Leaf node representing an integer constant."""
+    return IntegerLiteral(int(expr_node["value"]))
+
+
+def _decl_ref_name(node: Dict) -> Optional[str]:
+    """Return the (interned) variable named by a ``DeclRefExpr`` node, if present."""
+    name = node.get("name")
+    if name is None:
+        referenced = node.get("referencedDecl")
+        if referenced is not None:
+            name = referenced.get("name")
+    # Identifiers repeat throughout the AST and key the symbol tables later on;
+    # interning makes them share one object with a cached hash.
+    return sys.intern(name) if name is not None else None
+
+
+def _parse_decl_ref(expr_node: Dict, operands: List[Expression]) -> Expression:
+    """Reference to an existing variable declaration."""
+    name = _decl_ref_name(expr_node)
+    if name is None:
+        raise ValueError(f"Cannot extract name from DeclRefExpr: {expr_node}")
+    return DeclRef(name)
+
+
+def _parse_binary_operator(expr_node: Dict, operands: List[Expression]) -> Expression:
+    """Binary operator such as ``+`` or ``*``."""
+    # Opcodes repeat across the whole tree; keep one shared copy of each.
+    opcode = sys.intern(expr_node["opcode"])
+    lhs_expr, rhs_expr = operands
+
+    # Peephole: evaluate constant subexpressions and drop identity operations.
+    folded = _fold_binary(opcode, lhs_expr, rhs_expr)
+    if folded is not None:
+        return folded
+
+    # If exactly one operand is a constant, treat it as an immediate form.  A
+    # constant on the left only qualifies when the operands may be swapped;
+    # ``5 - x`` or ``1 < x`` stay plain binary operations.
+    lhs_lit = isinstance(lhs_expr, IntegerLiteral)
+    if lhs_lit ^ isinstance(rhs_expr, IntegerLiteral) and (not lhs_lit or opcode in _COMMUTATIVE_OPS):
+        return BinaryOperatorWithImmediate(opcode, lhs_expr, rhs_expr)
+    return BinaryOperator(opcode, lhs_expr, rhs_expr)
+
+
+def _parse_unary_operator(expr_node: Dict, operands: List[Expression]) -> Expression:
+    """Unary operation such as ``-x`` or ``x++``."""
+    opcode = sys.intern(expr_node["opcode"])
+    operand_expr = operands[0]
+    # Negative constants reach us as ``-`` applied to a literal; fold them.
+    if isinstance(operand_expr, IntegerLiteral) and opcode in _FOLD_UNARY:
+        return IntegerLiteral(_wrap_i32(_FOLD_UNARY[opcode](operand_expr.value)))
+    is_postfix = expr_node.get("isPostfix", False)
+    return UnaryOperator(opcode, operand_expr, is_postfix)
+
+
+def _no_operands(expr_node: Dict) -> List[Dict]:
+    return []
+
+
+def _first_operand(expr_node: Dict) -> List[Dict]:
+    # The operand is usually wrapped in an ImplicitCastExpr which is parsed
+    # (and stripped) like any other node.
+    return expr_node["inner"][:1]
+
+
+def _binary_operands(expr_node: Dict) -> List[Dict]:
+    inner_nodes = expr_node.get("inner", _NO_CHILDREN)
+    if len(inner_nodes) != 2:
+        raise ValueError(f"BinaryOperator must have 2 children: {expr_node}")
+    return inner_nodes
+
+
+# Wrapper nodes that carry no meaning for us; ``parse_expression`` looks
+# straight through them to their single child.
+_PASSTHROUGH_KINDS = frozenset(("ImplicitCastExpr", "ParenExpr"))
+
+# Map each Clang expression ``kind`` to the function building its dataclass
+# and the function returning the child nodes that must be parsed first.
+EXPR_HANDLERS = {
+    "IntegerLiteral": (_parse_integer_literal, _no_operands),
+    "DeclRefExpr": (_parse_decl_ref, _no_operands),
+    "BinaryOperator": (_parse_binary_operator, _binary_operands),
+    "UnaryOperator": (_parse_unary_operator, _first_operand),
+}
+
+
 def parse_expression(expr_node: Dict) -> Expression:
     """Convert a JSON AST expression node into an ``Expression`` instance.
 
+    The tree is walked in post-order with an explicit stack, so deeply nested
+    expressions do not run into Python's recursion limit.
+
     Parameters
     ----------
     expr_node:
@@ -141,63 +323,67 @@ def parse_expression(expr_node: Dict) -> Expression:
     Expression
         One of the dataclass instances defined in this module.
     """
-    # ``kind`` indicates which concrete expression class we must construct.
-    kind = expr_node["kind"]
-
-    # Ignore implicit casts by looking through them.
-    if kind == "ImplicitCastExpr":
-        return parse_expression(expr_node["inner"][0])
-
-    # Parentheses merely contain another expression.
-    if kind == "ParenExpr":
-        return parse_expression(expr_node["inner"][0])
-
-    # Leaf node representing an integer constant.
-    if kind == "IntegerLiteral":
-        return IntegerLiteral(int(expr_node["value"]))
-
-    # Reference to an existing variable declaration.
-    if kind == "DeclRefExpr":
-        if "name" in expr_node:
-            name = expr_node["name"]
-        elif "referencedDecl" in expr_node and "name" in expr_node["referencedDecl"]:
-            name = expr_node["referencedDecl"]["name"]
-        else:
-            raise ValueError(f"Cannot extract name from DeclRefExpr: {expr_node}")
-        return DeclRef(name)
+    results: List[Expression] = []
+    # Pending JSON nodes, or ``(node, handler, arity)`` tuples for nodes whose
+    # operands have been scheduled and only need to be combined.
+    stack: list = [expr_node]
+    append_result = results.append
+    push = stack.append
+
+    while stack:
+        item = stack.pop()
+
+        if type(item) is tuple:
+            node, handler, arity = item
+            operands = results[-arity:]
+            del results[-arity:]
+            append_result(handler(node, operands))
+            continue
+
+        # ``kind`` indicates which concrete expression class we must construct.
+        # Implicit casts and parentheses are unwrapped without a stack round trip.
+        kind = item["kind"]
+        while kind in _PASSTHROUGH_KINDS:
+            item = item["inner"][0]
+            kind = item["kind"]
+        entry = EXPR_HANDLERS.get(kind)
+        if entry is None:
+            raise ValueError(f"Unsupported expression node: {kind}")
+        handler, children = entry
+
+        child_nodes = children(item)
+        if not child_nodes:
+            append_result(handler(item, []))
+            continue
+        push((item, handler, len(child_nodes)))
+        stack.extend(reversed(child_nodes))
+
+    return results[0]
 
-    # Binary operator such as ``+`` or ``*``.
-    if kind == "BinaryOperator":
-        opcode = expr_node["opcode"]
-        inner_nodes = expr_node.get("inner", [])
-        if len(inner_nodes) != 2:
-            raise ValueError(f"BinaryOperator must have 2 children: {expr_node}")
 
-        # Recursively parse both operands.
-        lhs_expr = parse_expression(inner_nodes[0])
-        rhs_expr = parse_expression(inner_nodes[1])
+# -----------------------------------------------------------------------------
+# AST Parser (JSON -> Dataclasses)
+# -----------------------------------------------------------------------------
 
-        # If exactly one operand is a constant, treat it as an immediate form.
-        if isinstance(lhs_expr, IntegerLiteral) ^ isinstance(rhs_expr, IntegerLiteral):
-            return BinaryOperatorWithImmediate(opcode, lhs_expr, rhs_expr)
-        return BinaryOperator(opcode, lhs_expr, rhs_expr)
+def parse_function_decl(decl: Dict) -> Optional[FunctionDecl]:
+    """Convert a JSON ``FunctionDecl`` node into a :class:`FunctionDecl`.
 
-    # unary operations
-    if kind == "UnaryOperator":
-        opcode = expr_node["opcode"]
-        # The operand is usually wrapped in an ImplicitCastExpr — strip it.
-        operand_expr = parse_expression(expr_node["inner"][0])
-        is_postfix = expr_node.get("isPostfix", False)
-        return UnaryOperator(opcode, operand_expr, is_postfix)
-        
+    Returns ``None`` for declarations without a body (prototypes).
+    """
+    func_name = sys.intern(decl["name"])
+    compound_stmt = None
 
+    # Find the body of the function which is represented as a CompoundStmt.
+    for inner in decl.get("inner", _NO_CHILDREN):
+        if inner.get("kind") != "CompoundStmt":
+            continue
 
-    raise ValueError(f"Unsupported expression node: {kind}")
+        compound_stmt = _parse_compound_stmt(inner)
 
+    if compound_stmt is None:
+        return None
+    return FunctionDecl(func_name, compound_stmt)
 
-# -----------------------------------------------------------------------------
-# AST Parser (JSON -> Dataclasses)
-# -----------------------------------------------------------------------------
 
 def parse_ast(ast_json: Dict) -> TranslationUnit:
     """Convert a complete Clang JSON AST into a :class:`TranslationUnit`.
@@ -215,113 +401,170 @@ def parse_ast(ast_json: Dict) -> TranslationUnit:
     tu = TranslationUnit()
 
     # Walk over the top-level declarations in the JSON AST.
-    for decl in ast_json.get("inner", []):
+    for decl in ast_json.get("inner", _NO_CHILDREN):
         if decl.get("kind") != "FunctionDecl":
             continue  # Skip anything that isn't a function.
 
-        func_name = decl["name"]
-        compound_stmt = None
-
-        # Find the body of the function which is represented as a CompoundStmt.
-        for inner in decl.get("inner", []):
-            if inner.get("kind") != "CompoundStmt":
-                continue
+        # If we successfully built a function body, add the function to the TU.
+        func = parse_function_decl(decl)
+        if func is not None:
+            tu.decls.append(func)
 
-            compound_stmt = CompoundStmt()
+    return tu
 
-            # Iterate over all statements inside the compound statement.
-            for stmt in inner.get("inner", []):
-                parsed = parse_statement(stmt)
-                if parsed:
-                    if isinstance(parsed, list):
-                        compound_stmt.stmts.extend(parsed)
-                    else:
-                        compound_stmt.stmts.append(parsed)
 
+def _load_json(json_path: str) -> Dict:
+    """Load a whole JSON file, using :mod:`orjson` on a memory map if possible.
 
-        # If we successfully built a function body, add the function to the TU.
-        if compound_stmt:
-            tu.decls.append(FunctionDecl(func_name, compound_stmt))
+    ``orjson`` parses the mapped bytes directly, skipping both the copy into
+    a Python buffer and the UTF-8 decode to ``str`` that :func:`json.load`
+    performs first.
+    """
+    if orjson is None:
+        with open(json_path) as f:
+            return json.load(f)
+
+    with open(json_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm)
+        try:
+            return orjson.loads(view)
+        finally:
+            view.release()
+
+
+def parse_ast_file(json_path: str) -> TranslationUnit:
+    """Parse the Clang JSON AST stored in ``json_path``.
+
+    When :mod:`ijson` is installed the top-level declarations are streamed one
+    at a time, so only a single function's JSON is alive while it is converted
+    to dataclasses.  Otherwise the whole file is loaded (see
+    :func:`_load_json`) and handed to :func:`parse_ast`.  The whole-file path
+    is also taken when ijson only has its pure-Python backend and
+    :mod:`orjson` is available, since orjson is several times faster there.
+    """
+    if ijson is None or (orjson is not None and getattr(ijson, "backend", None) == "python"):
+        return parse_ast(_load_json(json_path))
 
+    tu = TranslationUnit()
+    with open(json_path, "rb") as f:
+        for decl in ijson.items(f, "inner.item"):
+            if decl.get("kind") != "FunctionDecl":
+                continue
+            func = parse_function_decl(decl)
+            if func is not None:
+                tu.decls.append(func)
     return tu
 
-def parse_statement(stmt: Dict) -> Optional[Union[VarDecl, AssignStmt, ReturnStmt, IfStmt]]:
-    kind = stmt.get("kind")
-
-    if kind == "DeclStmt":
-        decls: list[VarDecl] = []
-        for var_decl in stmt.get("inner", []):
-            if var_decl.get("kind") == "VarDecl":
-                init_expr = None
-                if "inner" in var_decl and var_decl["inner"]:
-                    init_expr = parse_expression(var_decl["inner"][0])
-                decls.append(VarDecl(var_decl["name"], init_expr))
-        return decls  # restituisce lista di VarDecl
-
-    elif kind == "BinaryOperator" and stmt["opcode"] == "=":
-        lhs = stmt["inner"][0]
-        rhs = stmt["inner"][1]
-        if lhs.get("kind") != "DeclRefExpr":
-            raise ValueError(f"Unsupported assignment LHS: {lhs['kind']}")
-        var_name = lhs.get("name") or lhs.get("referencedDecl", {}).get("name")
-        rhs_expr = parse_expression(rhs)
-        return AssignStmt(var_name, rhs_expr)
-
-    elif kind == "ReturnStmt":
-        if "inner" in stmt and stmt["inner"]:
-            return_expr = parse_expression(stmt["inner"][0])
-            return ReturnStmt(return_expr)
-        else:
-            return ReturnStmt()
+def _parse_decl_stmt(stmt: Dict) -> List[VarDecl]:
+    decls: list[VarDecl] = []
+    for var_decl in stmt.get("inner", _NO_CHILDREN):
+        if var_decl.get("kind") == "VarDecl":
+            init_expr = None
+            if "inner" in var_decl and var_decl["inner"]:
+                init_expr = parse_expression(var_decl["inner"][0])
+            decls.append(VarDecl(sys.intern(var_decl["name"]), init_expr))
+    return decls  # restituisce lista di VarDecl
+
+
+def _parse_assignment(stmt: Dict) -> Optional[AssignStmt]:
+    if stmt["opcode"] != "=":
+        return None
+    lhs, rhs = stmt["inner"][:2]
+    if lhs.get("kind") != "DeclRefExpr":
+        raise ValueError(f"Unsupported assignment LHS: {lhs['kind']}")
+    var_name = _decl_ref_name(lhs)
+    rhs_expr = parse_expression(rhs)
+    return AssignStmt(var_name, rhs_expr)
+
+
+def _parse_return_stmt(stmt: Dict) -> ReturnStmt:
+    if "inner" in stmt and stmt["inner"]:
+        return_expr = parse_expression(stmt["inner"][0])
+        return ReturnStmt(return_expr)
+    else:
+        return ReturnStmt()
 
-    elif kind == "IfStmt":
-        condition = parse_expression(stmt["inner"][0])
 
-        then_raw = stmt["inner"][1]
+def _parse_if_stmt(stmt: Dict) -> IfStmt:
+    condition = parse_expression(stmt["inner"][0])
+
+    then_raw = stmt["inner"][1]
+    if then_raw["kind"] == "CompoundStmt":
+        then_block = _parse_compound_stmt(then_raw)
+    else:
         then_block = CompoundStmt()
-        if then_raw["kind"] == "CompoundStmt":
-            for s in then_raw.get("inner", []):
-                parsed = parse_statement(s)
-                if parsed:
-                    then_block.stmts.append(parsed)
-
-        else_block = None
-        if len(stmt["inner"]) > 2:
-            else_raw = stmt["inner"][2]
-            if else_raw["kind"] == "IfStmt":
-                # this is an else if
-                nested_if = parse_statement(else_raw)
-                else_block = CompoundStmt(stmts=[nested_if]) if nested_if else None
-            elif else_raw["kind"] == "CompoundStmt":
-                else_block = CompoundStmt()
-                for s in else_raw.get("inner", []):
-                    parsed = parse_statement(s)
-                    if parsed:
-                        else_block.stmts.append(parsed)
-
-        return IfStmt(condition, then_block, else_block)
-    
-    elif kind == "ForStmt":
-        inner = stmt.get("inner", [])
-        real_inner = [x for x in inner if isinstance(x, dict) and 'kind' in x]
-
-        init_stmt = parse_statement(real_inner[0]) if len(real_inner) > 0 else None
-        if isinstance(init_stmt, list):  # fix qui
-            init_stmt = init_stmt[0] if init_stmt else None
-
-        condition_expr = parse_expression(real_inner[1]) if len(real_inner) > 1 else None
-        increment_stmt = parse_statement(real_inner[2]) if len(real_inner) > 2 else None
 
+    else_block = None
+    if len(stmt["inner"]) > 2:
+        else_raw = stmt["inner"][2]
+        if else_raw["kind"] == "IfStmt":
+            # this is an else if
+            nested_if = parse_statement(else_raw)
+            else_block = CompoundStmt(stmts=[nested_if]) if nested_if else None
+        elif else_raw["kind"] == "CompoundStmt":
+            else_block = _parse_compound_stmt(else_raw)
+
+    return IfStmt(condition, then_block, else_block)
+
+
+def _parse_for_stmt(stmt: Dict) -> ForStmt:
+    inner = stmt.get("inner", _NO_CHILDREN)
+    real_inner = [x for x in inner if isinstance(x, dict) and 'kind' in x]
+
+    init_stmt = parse_statement(real_inner[0]) if len(real_inner) > 0 else None
+    if isinstance(init_stmt, list):  # fix qui
+        init_stmt = init_stmt[0] if init_stmt else None
+
+    condition_expr = parse_expression(real_inner[1]) if len(real_inner) > 1 else None
+    increment_stmt = parse_statement(real_inner[2]) if len(real_inner) > 2 else None
+
+    if len(real_inner) > 3 and real_inner[3].get("kind") == "CompoundStmt":
+        body = _parse_compound_stmt(real_inner[3])
+    else:
         body = CompoundStmt()
-        if len(real_inner) > 3 and real_inner[3].get("kind") == "CompoundStmt":
-            for s in real_inner[3].get("inner", []):
-                parsed = parse_statement(s)
-                if parsed:
-                    body.stmts.append(parsed)
 
-        return ForStmt(init_stmt, condition_expr, increment_stmt, body)
+    return ForStmt(init_stmt, condition_expr, increment_stmt, body)
 
-    return None
+
+# Map each Clang statement ``kind`` to the function building its dataclass.
+STMT_HANDLERS = {
+    "DeclStmt": _parse_decl_stmt,
+    "BinaryOperator": _parse_assignment,
+    "ReturnStmt": _parse_return_stmt,
+    "IfStmt": _parse_if_stmt,
+    "ForStmt": _parse_for_stmt,
+}
+
+
+def parse_statement(stmt: Dict) -> Optional[Union[VarDecl, AssignStmt, ReturnStmt, IfStmt]]:
+    handler = STMT_HANDLERS.get(stmt.get("kind"))
+    if handler is None:
+        return None
+    return handler(stmt)
+
+
+def _parse_compound_stmt(compound: Dict) -> CompoundStmt:
+    """Parse the statements of a JSON ``CompoundStmt`` into a :class:`CompoundStmt`.
+
+    Function bodies and the bodies of ``if``/``for`` all go through here, so a
+    ``DeclStmt`` declaring several variables is flattened into its
+    :class:`VarDecl` entries everywhere instead of being appended as a list.
+    """
+    block = CompoundStmt()
+    append = block.stmts.append
+    extend = block.stmts.extend
+    handlers = STMT_HANDLERS
+    for stmt in compound.get("inner", _NO_CHILDREN):
+        handler = handlers.get(stmt.get("kind"))
+        if handler is None:
+            continue
+        parsed = handler(stmt)
+        if parsed:
+            if type(parsed) is list:
+                extend(parsed)
+            else:
+                append(parsed)
+    return block
 
 
 
@@ -330,70 +573,120 @@ def parse_statement(stmt: Dict) -> Optional[Union[VarDecl, AssignStmt, ReturnStm
 # Pretty-Printing Utilities
 # -----------------------------------------------------------------------------
 
-def pretty_print_statement(stmt, indent=1) -> List[str]:
-    """Pretty-print any statement with correct indentation."""
-    indent_str = "    " * indent
-    lines: List[str] = []
+def _print_var_decl(stmt: VarDecl, indent_str: str, indent: int, memo, lines: List[str]) -> None:
+    if stmt.init:
+        expr_str = pretty_print_expression(stmt.init, memo)
+        lines.append(f"{indent_str}int {stmt.name} = {expr_str};")
+    else:
+        lines.append(f"{indent_str}int {stmt.name};")
 
-    if isinstance(stmt, VarDecl):
-        if stmt.init:
-            expr_str = pretty_print_expression(stmt.init)
-            lines.append(f"{indent_str}int {stmt.name} = {expr_str};")
-        else:
-            lines.append(f"{indent_str}int {stmt.name};")
 
-    elif isinstance(stmt, AssignStmt):
-        expr_str = pretty_print_expression(stmt.value)
-        lines.append(f"{indent_str}{stmt.name} = {expr_str};")
+def _print_assign_stmt(stmt: AssignStmt, indent_str: str, indent: int, memo, lines: List[str]) -> None:
+    expr_str = pretty_print_expression(stmt.value, memo)
+    lines.append(f"{indent_str}{stmt.name} = {expr_str};")
 
-    elif isinstance(stmt, ReturnStmt):
-        if stmt.value:
-            expr_str = pretty_print_expression(stmt.value)
-            lines.append(f"{indent_str}return {expr_str};")
-        else:
-            lines.append(f"{indent_str}return;")
 
-    elif isinstance(stmt, IfStmt):
-        cond_str = pretty_print_expression(stmt.condition)
-        lines.append(f"{indent_str}if ({cond_str}) {{")
-        for inner in stmt.then_body.stmts:
-            lines.extend(pretty_print_statement(inner, indent + 1))
+def _print_return_stmt(stmt: ReturnStmt, indent_str: str, indent: int, memo, lines: List[str]) -> None:
+    if stmt.value:
+        expr_str = pretty_print_expression(stmt.value, memo)
+        lines.append(f"{indent_str}return {expr_str};")
+    else:
+        lines.append(f"{indent_str}return;")
+
+
+def _print_if_stmt(stmt: IfStmt, indent_str: str, indent: int, memo, lines: List[str]) -> None:
+    cond_str = pretty_print_expression(stmt.condition, memo)
+    lines.append(f"{indent_str}if ({cond_str}) {{")
+    for inner in stmt.then_body.stmts:
+        pretty_print_statement(inner, indent + 1, memo, lines)
+    lines.append(f"{indent_str}}}")
+    if stmt.else_body:
+        lines.append(f"{indent_str}else {{")
+        for inner in stmt.else_body.stmts:
+            pretty_print_statement(inner, indent + 1, memo, lines)
         lines.append(f"{indent_str}}}")
-        if stmt.else_body:
-            lines.append(f"{indent_str}else {{")
-            for inner in stmt.else_body.stmts:
-                lines.extend(pretty_print_statement(inner, indent + 1))
-            lines.append(f"{indent_str}}}")
-    
-    elif isinstance(stmt, ForStmt):
-        # Print init (either VarDecl or AssignStmt)
-        if isinstance(stmt.init, VarDecl):
-            init_str = f"int {stmt.init.name} = {pretty_print_expression(stmt.init.init)}" if stmt.init.init else f"int {stmt.init.name}"
-        elif isinstance(stmt.init, AssignStmt):
-            init_str = f"{stmt.init.name} = {pretty_print_expression(stmt.init.value)}"
-        else:
-            init_str = ''
-
-        # Print condition
-        cond_str = pretty_print_expression(stmt.condition) if stmt.condition else ''
-
-        # Print increment (must be an AssignStmt)
-        if isinstance(stmt.increment, AssignStmt):
-            incr_str = f"{stmt.increment.name} = {pretty_print_expression(stmt.increment.value)}"
-        else:
-            incr_str = ''
 
-        # Emit the for loop
-        lines.append(f"{indent_str}for ({init_str}; {cond_str}; {incr_str}) {{")
-        for inner in stmt.body.stmts:
-            lines.extend(pretty_print_statement(inner, indent + 1))
-        lines.append(f"{indent_str}}}")
 
+def _print_for_stmt(stmt: ForStmt, indent_str: str, indent: int, memo, lines: List[str]) -> None:
+    # Print init (either VarDecl or AssignStmt)
+    if isinstance(stmt.init, VarDecl):
+        init_str = f"int {stmt.init.name} = {pretty_print_expression(stmt.init.init, memo)}" if stmt.init.init else f"int {stmt.init.name}"
+    elif isinstance(stmt.init, AssignStmt):
+        init_str = f"{stmt.init.name} = {pretty_print_expression(stmt.init.value, memo)}"
+    else:
+        init_str = ''
 
-    
+    # Print condition
+    cond_str = pretty_print_expression(stmt.condition, memo) if stmt.condition else ''
 
+    # Print increment (must be an AssignStmt)
+    if isinstance(stmt.increment, AssignStmt):
+        incr_str = f"{stmt.increment.name} = {pretty_print_expression(stmt.increment.value, memo)}"
     else:
+        incr_str = ''
+
+    # Emit the for loop
+    lines.append(f"{indent_str}for ({init_str}; {cond_str}; {incr_str}) {{")
+    for inner in stmt.body.stmts:
+        pretty_print_statement(inner, indent + 1, memo, lines)
+    lines.append(f"{indent_str}}}")
+
+
+# Map each statement class to the function printing it, so dispatch is a
+# single dict lookup on ``type(stmt)``.
+STMT_PRINTERS = {
+    VarDecl: _print_var_decl,
+    AssignStmt: _print_assign_stmt,
+    ReturnStmt: _print_return_stmt,
+    IfStmt: _print_if_stmt,
+    ForStmt: _print_for_stmt,
+}
+
+
+def pretty_print_statement(
+    stmt, indent=1, memo: Optional[Dict[int, str]] = None, lines: Optional[List[str]] = None
+) -> List[str]:
+    """Pretty-print any statement with correct indentation.
+
+    ``memo`` is forwarded to :func:`pretty_print_expression` so expressions
+    shared between statements are only formatted once.  The lines are
+    appended to ``lines`` when given, so nested statements and whole
+    functions fill one list instead of building and copying one per
+    statement; that list is returned.
+    """
+    indent_str = "    " * indent
+    if lines is None:
+        lines = []
+
+    printer = STMT_PRINTERS.get(type(stmt))
+    if printer is None:
         lines.append(f"{indent_str}// Unsupported statement: {type(stmt).__name__}")
+    else:
+        printer(stmt, indent_str, indent, memo, lines)
+
+    return lines
+
+def pretty_print_function(func: FunctionDecl, lines: Optional[List[str]] = None) -> List[str]:
+    """Pretty-print a single function definition followed by a blank line.
+
+    As with :func:`pretty_print_statement`, the lines are appended to
+    ``lines`` when given, and the list is returned.
+    """
+    if lines is None:
+        lines = []
+    append = lines.append
+
+    # Formatted expressions keyed by node identity; valid while ``func`` is alive.
+    memo: Dict[int, str] = {}
+
+    params = ", ".join(map("int {}".format, func.params))
+    append(f"int {func.name}({params}) {{")
+
+    for stmt in func.body.stmts:
+        pretty_print_statement(stmt, 1, memo, lines)
+
+    append("}")
+    append("")
 
     return lines
 
@@ -401,53 +694,72 @@ def pretty_print_translation_unit(tu: TranslationUnit) -> str:
     lines: List[str] = []
 
     for func in tu.decls:
-        params = ", ".join(f"int {p}" for p in func.params)
-        lines.append(f"int {func.name}({params}) {{")
-
-        for stmt in func.body.stmts:
-            lines.extend(pretty_print_statement(stmt, indent=1))
-
-        lines.append("}")
-        lines.append("")
+        pretty_print_function(func, lines)
 
     return "\n".join(lines)
 
 
-def pretty_print_expression(expr: Expression) -> str:
+def pretty_print_expression(expr: Expression, memo: Optional[Dict[int, str]] = None) -> str:
     """Convert an :class:`Expression` into a C-style string.
 
+    The text is produced by an iterative walk that appends tokens to a single
+    list, so no intermediate strings are built for inner nodes.
+
     Parameters
     ----------
     expr:
         Expression node to print.
+    memo:
+        Optional cache of already formatted expressions keyed by ``id``.  Any
+        node found in it is reused verbatim and the text of ``expr`` is added
+        to it.  The caller must keep the nodes alive while the cache is in use.
 
     Returns
     -------
     str
         A textual representation of ``expr``.
     """
-    # Integer constants appear as-is.
-    if isinstance(expr, IntegerLiteral):
-        return str(expr.value)
-    # Variables are referenced by name.
-    if isinstance(expr, DeclRef):
-        return expr.name
-    # Unary operations
-    if isinstance(expr, UnaryOperator):
-        operand = pretty_print_expression(expr.operand)
-        if expr.is_postfix:
-            return f"({operand}{expr.opcode})"
+    if memo is not None:
+        text = memo.get(id(expr))
+        if text is not None:
+            return text
+
+    parts: List[str] = []
+    emit = parts.append
+    # Pending nodes and literal tokens, in reverse order of emission.
+    stack: list = [expr]
+    push = stack.extend
+
+    while stack:
+        item = stack.pop()
+        if type(item) is str:
+            emit(item)
+            continue
+        if memo is not None:
+            text = memo.get(id(item))
+            if text is not None:
+                emit(text)
+                continue
+
+        # Integer constants appear as-is.
+        if isinstance(item, IntegerLiteral):
+            emit(str(item.value))
+        # Variables are referenced by name.
+        elif isinstance(item, DeclRef):
+            emit(item.name)
+        # Unary operations
+        elif isinstance(item, UnaryOperator):
+            if item.is_postfix:
+                push((")", item.opcode, item.operand, "("))
+            else:
+                push((")", item.operand, item.opcode, "("))
+        # Binary operators (with or without immediate) use infix notation.
+        elif isinstance(item, (BinaryOperator, BinaryOperatorWithImmediate)):
+            push((")", item.rhs, f" {item.opcode} ", item.lhs, "("))
         else:
-            return f"({expr.opcode}{operand})"
-    # Standard binary operator using infix notation.
-    if isinstance(expr, BinaryOperator):
-        lhs = pretty_print_expression(expr.lhs)
-        rhs = pretty_print_expression(expr.rhs)
-        return f"({lhs} {expr.opcode} {rhs})"
-    # Binary operator where one side is an immediate.
-    if isinstance(expr, BinaryOperatorWithImmediate):
-        lhs = pretty_print_expression(expr.lhs)
-        rhs = pretty_print_expression(expr.rhs)
-        return f"({lhs} {expr.opcode} {rhs})"
-    return "<unsupported_expr>"
+            emit("<unsupported_expr>")
 
+    text = "".join(parts)
+    if memo is not None:
+        memo[id(expr)] = text
+    return text
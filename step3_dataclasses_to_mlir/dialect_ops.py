@@ -12,6 +12,7 @@ verification facilities.
 
 from __future__ import annotations
 import abc
+import functools
 from typing import ClassVar
 
 from xdsl.ir import Operation, SSAValue, Block
@@ -47,6 +48,16 @@ from xdsl.utils.exceptions import VerifyException
 signlessIntegerLike = AnyOf([IntegerType, IndexType])
 
 
+@functools.lru_cache(maxsize=4096)
+def _integer_attr(value: int, ty: Attribute) -> IntegerAttr:
+    """Return a shared ``IntegerAttr`` for ``value`` of type ``ty``.
+
+    Attributes are immutable, so ops using the same immediate (``x + 1``,
+    ``x * 2``...) can all point at one instance instead of allocating their own.
+    """
+    return IntegerAttr(value, ty)
+
+
 # -----------------------------------------------------------------------------
 # Base Classes
 # -----------------------------------------------------------------------------
@@ -70,7 +81,7 @@ class SignlessIntegerBinaryOpWithImmediate(IRDLOperation, abc.ABC):
         # ``imm`` can be provided as a Python int for convenience.  Convert it
         # to an ``IntegerAttr`` using the type of ``lhs``.
         if isinstance(imm, int):
-            imm = IntegerAttr(imm, lhs.type)
+            imm = _integer_attr(imm, lhs.type)
         if result_type is None:
             result_type = lhs.type
         super().__init__(operands=[lhs], result_types=[result_type], properties={"imm": imm})
@@ -139,7 +150,7 @@ class SignlessIntegerBinaryOpWithImmediateAndOverflow(SignlessIntegerBinaryOpWit
     ):
         """Create the operation with overflow semantics."""
         if isinstance(imm, int):
-            imm = IntegerAttr(imm, lhs.type)
+            imm = _integer_attr(imm, lhs.type)
         if result_type is None:
             result_type = lhs.type
         super().__init__(lhs=lhs, imm=imm, result_type=result_type)
@@ -1,4 +1,4 @@
-from xdsl.ir import Block, Region, SSAValue
+from xdsl.ir import Block, Operation, Region, SSAValue
 from xdsl.dialects.builtin import i32
 from xdsl.dialects.func import FuncOp, ReturnOp
 from xdsl.dialects.arith import ConstantOp, AddiOp, SubiOp, MuliOp, DivSIOp, CmpiOp, ExtUIOp
@@ -22,129 +22,209 @@ from step2_ast_to_dataclasses.c_ast import (
 
 MAX_UNROLL = 10
 
+# C operator -> MLIR op class / comparison predicate.
+ARITH_OPS = {'+': AddiOp, '-': SubiOp, '*': MuliOp, '/': DivSIOp}
+IMM_ARITH_OPS = {'+': AddiImmOp, '-': SubiImmOp, '*': MuliImmOp, '/': DivSImmOp}
+INCDEC_OPS = {'++': AddiImmOp, '--': SubiImmOp}
+CMP_PREDICATES = {'==': "eq", '!=': "ne", '<': "slt", '<=': "sle", '>': "sgt", '>=': "sge"}
+
+
+def _no_operands(expr: Expression) -> tuple:
+    return ()
+
+
+def _unary_operands(expr: UnaryOperator) -> tuple:
+    return (expr.operand,)
+
+
+def _binary_operands(expr: BinaryOperator) -> tuple:
+    return (expr.lhs, expr.rhs)
+
+
+def _immediate_operands(expr: BinaryOperatorWithImmediate) -> tuple:
+    # Only the non-literal side needs lowering; the literal becomes the
+    # immediate.  Neither being a literal is reported by the handler.
+    if isinstance(expr.lhs, IntegerLiteral):
+        return (expr.rhs,)
+    if isinstance(expr.rhs, IntegerLiteral):
+        return (expr.lhs,)
+    return ()
+
+
 class MLIRGenerator:
     def __init__(self) -> None:
         self.symbol_table: dict[str, SSAValue | None] = {}
         self.current_block: Block | None = None
         self.function_region: Region | None = None
+        # Ops destined for ``current_block``; attached in bulk by ``_flush``.
+        self._pending_ops: list[Operation] = []
+        # Constants already materialised in ``current_block`` (value -> SSA).
+        self.const_cache: dict[int, SSAValue] = {}
+        # Expression class -> (lowering method, sub-expressions to lower
+        # first), so dispatch is one dict lookup.
+        self._expression_handlers = {
+            IntegerLiteral: (self._lower_integer_literal, _no_operands),
+            DeclRef: (self._lower_decl_ref, _no_operands),
+            UnaryOperator: (self._lower_unary_operator, _unary_operands),
+            BinaryOperator: (self._lower_binary_operator, _binary_operands),
+            BinaryOperatorWithImmediate: (
+                self._lower_binary_operator_with_immediate,
+                _immediate_operands,
+            ),
+        }
+
+    def _emit(self, op: Operation) -> None:
+        self._pending_ops.append(op)
+
+    def _flush(self) -> None:
+        """Attach the ops emitted so far to ``current_block``."""
+        if self._pending_ops:
+            self.current_block.add_ops(self._pending_ops)
+            self._pending_ops = []
+
+    def _switch_block(self, block: Block) -> None:
+        """Make ``block`` the insertion point, flushing the previous one."""
+        self._flush()
+        self.current_block = block
+        # Constants of another block do not necessarily dominate this one.
+        self.const_cache = {}
+
+    def _constant(self, value: int) -> SSAValue:
+        """Return an ``i32`` constant, emitting it once per block."""
+        val = self.const_cache.get(value)
+        if val is None:
+            op = ConstantOp.from_int_and_width(value, 32)
+            self._emit(op)
+            val = self.const_cache[value] = op.results[0]
+        return val
 
     def process_expression(self, expr: Expression) -> SSAValue:
-        if isinstance(expr, IntegerLiteral):
-            op = ConstantOp.from_int_and_width(expr.value, 32)
-            self.current_block.add_op(op)
+        """Lower ``expr`` and return the SSA value holding its result.
+
+        Sub-expressions are lowered in post-order with an explicit stack, so
+        deeply nested expressions do not run into Python's recursion limit.
+        """
+        handlers = self._expression_handlers
+        values: list[SSAValue] = []
+        # Pending expressions, or ``(expr, handler, arity)`` tuples for
+        # expressions whose operands have been scheduled and only need to be
+        # combined.
+        stack: list = [expr]
+        push = stack.append
+        append_value = values.append
+        pop = stack.pop
+
+        while stack:
+            item = pop()
+
+            if type(item) is tuple:
+                node, handler, arity = item
+                operands = values[-arity:]
+                del values[-arity:]
+                append_value(handler(node, *operands))
+                continue
+
+            entry = handlers.get(type(item))
+            if entry is None:
+                raise TypeError(f"Unsupported expression type: {type(item)}")
+            handler, children = entry
+
+            child_exprs = children(item)
+            if not child_exprs:
+                append_value(handler(item))
+                continue
+            push((item, handler, len(child_exprs)))
+            stack.extend(reversed(child_exprs))
+
+        return values[0]
+
+    def _lower_integer_literal(self, expr: IntegerLiteral) -> SSAValue:
+        return self._constant(expr.value)
+
+    def _lower_decl_ref(self, expr: DeclRef) -> SSAValue:
+        # Undeclared and declared-but-uninitialised names both come back as None.
+        val = self.symbol_table.get(expr.name)
+        if val is None:
+            raise ValueError(f"Use of undeclared or uninitialized variable '{expr.name}'")
+        return val
+
+    def _lower_unary_operator(self, expr: UnaryOperator, operand_val: SSAValue) -> SSAValue:
+        opcode = expr.opcode
+        if opcode == '+':
+            return operand_val
+        if opcode == '-':
+            op = SubiOp(self._constant(0), operand_val)
+            self._emit(op)
             return op.results[0]
-        
-        if isinstance(expr, DeclRef):
-            if expr.name not in self.symbol_table or self.symbol_table[expr.name] is None:
-                raise ValueError(f"Use of undeclared or uninitialized variable '{expr.name}'")
-            return self.symbol_table[expr.name]
-
-        if isinstance(expr, UnaryOperator):
-            operand_val = self.process_expression(expr.operand)
-            if expr.opcode == '+':
-                return operand_val
-            if expr.opcode == '-':
-                zero = ConstantOp.from_int_and_width(0, 32)
-                self.current_block.add_op(zero)
-                op = SubiOp(zero.results[0], operand_val)
-                self.current_block.add_op(op)
-                return op.results[0]
-            if expr.opcode == '!':
-                zero = ConstantOp.from_int_and_width(0, 32)
-                self.current_block.add_op(zero)
-                cmp = CmpiOp(operand_val, zero.results[0], "eq")
-                self.current_block.add_op(cmp)
-                return cmp.results[0]
-            if expr.opcode == '~':
-                zero = ConstantOp.from_int_and_width(0, 32)
-                one = ConstantOp.from_int_and_width(1, 32)
-                self.current_block.add_op(zero)
-                self.current_block.add_op(one)
-                neg = SubiOp(zero.results[0], operand_val)
-                self.current_block.add_op(neg)
-                res = SubiOp(neg.results[0], one.results[0])
-                self.current_block.add_op(res)
-                return res.results[0]
-            if expr.opcode in ('++', '--'):
-                if not isinstance(expr.operand, DeclRef):
-                    raise ValueError("Increment/decrement requires variable reference")
-                var_name = expr.operand.name
-                imm = 1
-                if expr.opcode == '++':
-                    op = AddiImmOp(operand_val, imm)
-                else:
-                    op = SubiImmOp(operand_val, imm)
-                self.current_block.add_op(op)
-                self.symbol_table[var_name] = op.results[0]
-                return operand_val if expr.is_postfix else op.results[0]
-            raise ValueError(f"Unsupported unary operator: {expr.opcode}")
-
-        if isinstance(expr, BinaryOperator):
-            lhs_val = self.process_expression(expr.lhs)
-            rhs_val = self.process_expression(expr.rhs)
-            arith_map = {'+': AddiOp, '-': SubiOp, '*': MuliOp, '/': DivSIOp}
-            cmp_map = {'==': "eq", '!=': "ne", '<': "slt", '<=': "sle", '>': "sgt", '>=': "sge"}
-
-            if expr.opcode in arith_map:
-                op = arith_map[expr.opcode](lhs_val, rhs_val)
-                self.current_block.add_op(op)
+        if opcode == '!':
+            cmp = CmpiOp(operand_val, self._constant(0), "eq")
+            self._emit(cmp)
+            return cmp.results[0]
+        if opcode == '~':
+            zero = self._constant(0)
+            one = self._constant(1)
+            neg = SubiOp(zero, operand_val)
+            self._emit(neg)
+            res = SubiOp(neg.results[0], one)
+            self._emit(res)
+            return res.results[0]
+        step_cls = INCDEC_OPS.get(opcode)
+        if step_cls is not None:
+            if not isinstance(expr.operand, DeclRef):
+                raise ValueError("Increment/decrement requires variable reference")
+            op = step_cls(operand_val, 1)
+            self._emit(op)
+            self.symbol_table[expr.operand.name] = op.results[0]
+            return operand_val if expr.is_postfix else op.results[0]
+        raise ValueError(f"Unsupported unary operator: {opcode}")
+
+    def _lower_binary_operator(self, expr: BinaryOperator, lhs_val: SSAValue, rhs_val: SSAValue) -> SSAValue:
+        op_cls = ARITH_OPS.get(expr.opcode)
+        if op_cls is not None:
+            op = op_cls(lhs_val, rhs_val)
+            self._emit(op)
+            return op.results[0]
+        predicate = CMP_PREDICATES.get(expr.opcode)
+        if predicate is not None:
+            op = CmpiOp(lhs_val, rhs_val, predicate)
+            self._emit(op)
+            return op.results[0]
+        raise ValueError(f"Unsupported binary operator: {expr.opcode}")
+
+    def _lower_binary_operator_with_immediate(
+        self, expr: BinaryOperatorWithImmediate, operand_val: SSAValue | None = None
+    ) -> SSAValue:
+        # caso: immediato a sinistra
+        if isinstance(expr.lhs, IntegerLiteral):
+            imm_val = expr.lhs.value
+            rhs_val = operand_val
+
+            if expr.opcode in ('+', '*'):  # commutativi
+                op = IMM_ARITH_OPS[expr.opcode](rhs_val, imm_val)
+                self._emit(op)
                 return op.results[0]
-            elif expr.opcode in cmp_map:
-                op = CmpiOp(lhs_val, rhs_val, cmp_map[expr.opcode])
-                self.current_block.add_op(op)
+            else:
+                raise ValueError(f"Unsupported lhs-immediate for non-commutative op: {expr.opcode}")
+
+        # caso: immediato a destra
+        elif isinstance(expr.rhs, IntegerLiteral):
+            lhs_val = operand_val
+            imm_val = expr.rhs.value
+
+            op_cls = IMM_ARITH_OPS.get(expr.opcode)
+            if op_cls is not None:
+                op = op_cls(lhs_val, imm_val)
+                self._emit(op)
                 return op.results[0]
-            raise ValueError(f"Unsupported binary operator: {expr.opcode}")
-
-        if isinstance(expr, BinaryOperatorWithImmediate):
-            arith_map = {
-                '+': AddiImmOp,
-                '-': SubiImmOp,
-                '*': MuliImmOp,
-                '/': DivSImmOp,
-            }
-
-            cmp_map = {
-                '==': "eq",
-                '!=': "ne",
-                '<': "slt",
-                '<=': "sle",
-                '>': "sgt",
-                '>=': "sge",
-            }
-
-            # caso: immediato a sinistra
-            if isinstance(expr.lhs, IntegerLiteral):
-                imm_val = expr.lhs.value
-                rhs_val = self.process_expression(expr.rhs)
-
-                if expr.opcode in ('+', '*'):  # commutativi
-                    op = arith_map[expr.opcode](rhs_val, imm_val)
-                    self.current_block.add_op(op)
-                    return op.results[0]
-                else:
-                    raise ValueError(f"Unsupported lhs-immediate for non-commutative op: {expr.opcode}")
-
-            # caso: immediato a destra
-            elif isinstance(expr.rhs, IntegerLiteral):
-                lhs_val = self.process_expression(expr.lhs)
-                imm_val = expr.rhs.value
-
-                if expr.opcode in arith_map:
-                    op = arith_map[expr.opcode](lhs_val, imm_val)
-                    self.current_block.add_op(op)
-                    return op.results[0]
-                
-                elif expr.opcode in cmp_map:
-                    const_op = ConstantOp.from_int_and_width(imm_val, 32)
-                    self.current_block.add_op(const_op)
-                    rhs_val = const_op.results[0]
-                    cmp_op = CmpiOp(lhs_val, rhs_val, cmp_map[expr.opcode])
-                    self.current_block.add_op(cmp_op)
-                    return cmp_op.results[0]
-
-            raise ValueError("BinaryOperatorWithImmediate must contain an IntegerLiteral on one side")
-
-        raise TypeError(f"Unsupported expression type: {type(expr)}")
+
+            predicate = CMP_PREDICATES.get(expr.opcode)
+            if predicate is not None:
+                rhs_val = self._constant(imm_val)
+                cmp_op = CmpiOp(lhs_val, rhs_val, predicate)
+                self._emit(cmp_op)
+                return cmp_op.results[0]
+
+        raise ValueError("BinaryOperatorWithImmediate must contain an IntegerLiteral on one side")
 
 
     def lower_if(self, stmt: IfStmt, tail: list) -> None:
@@ -179,16 +259,16 @@ class MLIRGenerator:
         self.function_region.add_block(then_block)
         self.function_region.add_block(else_block)
 
-        self.current_block.add_op(CondBranchOp(cond_val, then_block, [], else_block, []))
+        self._emit(CondBranchOp(cond_val, then_block, [], else_block, []))
 
         original_symtable = dict(self.symbol_table)
 
         self.symbol_table = dict(original_symtable)
-        self.current_block = then_block
+        self._switch_block(then_block)
         self._lower_block(stmt.then_body.stmts + tail)
 
         self.symbol_table = dict(original_symtable)
-        self.current_block = else_block
+        self._switch_block(else_block)
         if stmt.else_body:
             self._lower_block(stmt.else_body.stmts + tail)
         else:
@@ -205,13 +285,13 @@ class MLIRGenerator:
         else_block = Block()
         self.function_region.add_block(then_block)
         self.function_region.add_block(else_block)
-        self.current_block.add_op(CondBranchOp(cond_val, then_block, [], else_block, []))
+        self._emit(CondBranchOp(cond_val, then_block, [], else_block, []))
 
-        self.current_block = else_block
+        self._switch_block(else_block)
         self._lower_block(tail)
 
         for _ in range(MAX_UNROLL):
-            self.current_block = then_block
+            self._switch_block(then_block)
             self._lower_block(stmt.body.stmts)
 
             if stmt.increment:
@@ -222,9 +302,9 @@ class MLIRGenerator:
             next_else = Block()
             self.function_region.add_block(next_then)
             self.function_region.add_block(next_else)
-            self.current_block.add_op(CondBranchOp(cond_val, next_then, [], next_else, []))
+            self._emit(CondBranchOp(cond_val, next_then, [], next_else, []))
 
-            self.current_block = next_else
+            self._switch_block(next_else)
             self._lower_block(tail)
 
             then_block = next_then
@@ -245,16 +325,19 @@ class MLIRGenerator:
                 self.symbol_table[stmt.name] = self.process_expression(stmt.value)
             elif isinstance(stmt, ReturnStmt):
                 ret_val = self.process_expression(stmt.value) if stmt.value else []
-                self.current_block.add_op(ReturnOp(ret_val))
+                self._emit(ReturnOp(ret_val))
                 return
             i += 1
 
     def generate_function(self, func: FunctionDecl) -> FuncOp:
         self.symbol_table.clear()
+        self._pending_ops = []
+        self.const_cache = {}
         entry_block = Block()
         self.function_region = Region()
         self.function_region.add_block(entry_block)
         self.current_block = entry_block
         self._lower_block(func.body.stmts)
+        self._flush()
         func_type = ([i32] * len(func.params), [i32])
         return FuncOp(func.name, func_type, self.function_region)
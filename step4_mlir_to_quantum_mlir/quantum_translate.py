@@ -29,8 +29,26 @@ from .quantum_dialect import (
     QAndOp,QCmpiOp, QNotOp, QuantumCInitOp, CQAddiImmOp, CQSubiImmOp, CQMuliImmOp, CQDivSImmOp,
 )
 
-
-@dataclass
+# Opcode strings for the classical operations, and the quantum operation class
+# emitted for each opcode.  Built once here instead of on every translated op.
+_BINARY_OPCODES = {
+    AddiOp.name: "add", SubiOp.name: "sub", MuliOp.name: "mul", DivSIOp.name: "div",
+}
+_BINARY_IMM_OPCODES = {
+    "iarith.addi_imm": "add",
+    "iarith.subi_imm": "sub",
+    "iarith.muli_imm": "mul",
+    "iarith.divsi_imm": "div",
+}
+_BINARY_OP_CLS = {"add": QAddiOp, "sub": QSubiOp, "mul": QMuliOp, "div": QDivSOp}
+_CONTROLLED_BINARY_OP_CLS = {"add": CQAddiOp, "sub": CQSubiOp, "mul": CQMuliOp, "div": CQDivSOp}
+_BINARY_IMM_OP_CLS = {"add": QAddiImmOp, "sub": QSubiImmOp, "mul": QMuliImmOp, "div": QDivSImmOp}
+_CONTROLLED_BINARY_IMM_OP_CLS = {
+    "add": CQAddiImmOp, "sub": CQSubiImmOp, "mul": CQMuliImmOp, "div": CQDivSImmOp,
+}
+
+
+@dataclass(slots=True)
 class ValueInfo:
     """Metadata about how a value is produced and stored.
 
@@ -84,12 +102,14 @@ class QuantumTranslator:
 
         # Track, for each register, which version of the value it currently
         # holds.  This allows the translator to detect when a cached value has
-        # been overwritten and needs recomputation.
-        self.reg_version: Dict[int, int] = {}
+        # been overwritten and needs recomputation.  Register identifiers are
+        # dense (allocated sequentially), so this and ``reg_ssa`` are lists
+        # indexed by the identifier rather than dictionaries.
+        self.reg_version: list[int] = []
 
         # Map each register identifier to the most recent SSA value representing
         # its contents in the quantum module being built.
-        self.reg_ssa: Dict[int, SSAValue] = {}
+        self.reg_ssa: list[SSAValue | None] = []
 
         # Number of remaining uses for every SSA value in the original module.
         self.use_count: Dict[SSAValue, int] = {}
@@ -109,122 +129,135 @@ class QuantumTranslator:
 
 
     def translate_op(self, op: Operation):
-        if isinstance(op, ConstantOp):
-            value = op.value.value.data
-            ctrl = self.get_current_control()
-            if ctrl is None:
-                init_op = QuantumInitOp(value)
-            else:
-                init_op = QuantumCInitOp(ctrl, value)
+        """Translate ``op`` by dispatching on its operation name."""
+        handler = self._op_handlers.get(op.name)
+        if handler is None:
+            raise NotImplementedError(f"Unsupported op {op.name}")
+        handler(self, op)
 
-            reg = self.allocate_reg()
-            self.current_block.add_op(init_op)
-            init_op.results[0].name_hint = f"q{reg}_0"
-            self.val_info[op.results[0]] = ValueInfo(reg, 0, ("const", value))
-            self.reg_ssa[reg] = init_op.results[0]
-            self.reg_version[reg] = 0
+    def _translate_constant(self, op: Operation):
+        value = op.value.value.data
+        ctrl = self.get_current_control()
+        if ctrl is None:
+            init_op = QuantumInitOp(value)
+        else:
+            init_op = QuantumCInitOp(ctrl, value)
 
-        elif isinstance(op, (AddiOp, SubiOp, MuliOp, DivSIOp)):
-            lhs, rhs = op.operands
-            q_lhs = self.emit_value(lhs)
-            q_rhs = self.emit_value(rhs)
-            if q_lhs is q_rhs:
-                q_rhs = self.duplicate_value(rhs)
-            opcode = {
-                AddiOp: "add", SubiOp: "sub", MuliOp: "mul", DivSIOp: "div",
-            }[type(op)]
-            reg = self.allocate_reg()
-            new_op = self.create_binary_op(opcode, q_lhs, q_rhs)
-            self.current_block.add_op(new_op)
-            new_op.results[0].name_hint = f"q{reg}_0"
-            self.reg_ssa[reg] = new_op.results[0]
-            self.val_info[op.results[0]] = ValueInfo(reg, 0, ("binary", (opcode, lhs, rhs)))
-
-        elif op.name == "arith.cmpi":
-            lhs, rhs = op.operands
-            predicate = int(op.predicate.value.data)
-            q_lhs = self.emit_value(lhs)
-            q_rhs = self.emit_value(rhs)
-            cmp_op = QCmpiOp(q_lhs, q_rhs, predicate)
-            self.current_block.add_op(cmp_op)
+        reg = self.allocate_reg()
+        self.current_block.add_op(init_op)
+        init_op.results[0].name_hint = f"q{reg}_0"
+        self.val_info[op.results[0]] = ValueInfo(reg, 0, ("const", value))
+        self.reg_ssa[reg] = init_op.results[0]
+        self.reg_version[reg] = 0
 
-            reg = self.allocate_reg()
-            cmp_op.results[0].name_hint = f"q{reg}_0"
-            self.reg_ssa[reg] = cmp_op.results[0]
-            self.reg_version[reg] = 0
+    def _translate_binary(self, op: Operation):
+        lhs, rhs = op.operands
+        q_lhs = self.emit_value(lhs)
+        q_rhs = self.emit_value(rhs)
+        if q_lhs is q_rhs:
+            q_rhs = self.duplicate_value(rhs)
+        opcode = _BINARY_OPCODES[op.name]
+        reg = self.allocate_reg()
+        new_op = self.create_binary_op(opcode, q_lhs, q_rhs)
+        self.current_block.add_op(new_op)
+        new_op.results[0].name_hint = f"q{reg}_0"
+        self.reg_ssa[reg] = new_op.results[0]
+        self.val_info[op.results[0]] = ValueInfo(reg, 0, ("binary", (opcode, lhs, rhs)))
+
+    def _translate_cmpi(self, op: Operation):
+        lhs, rhs = op.operands
+        predicate = int(op.predicate.value.data)
+        q_lhs = self.emit_value(lhs)
+        q_rhs = self.emit_value(rhs)
+        cmp_op = QCmpiOp(q_lhs, q_rhs, predicate)
+        self.current_block.add_op(cmp_op)
 
-            self.val_info[op.results[0]] = ValueInfo(reg, 0, ("cmpi", lhs, rhs, predicate))
-        
-        elif op.name == "cf.cond_br":
-            cond_val = self.emit_value(op.operands[0])
-            true_block = op.successors[0]
-            false_block = op.successors[1]
-
-            # Push condition for 'then'
-            self.control_stack.append(cond_val)
-            for inner_op in true_block.ops:
-                self.translate_op(inner_op)
-            self.control_stack.pop()
-
-            # Invert the condition using NOT
-            inverted = QNotOp(cond_val)
-            self.current_block.add_op(inverted)
-
-            inverted_reg = self.allocate_reg()
-            inverted.results[0].name_hint = f"q{inverted_reg}_0"
-            self.reg_version[inverted_reg] = 0
-            self.reg_ssa[inverted_reg] = inverted.results[0]
-
-
-            # Push inverted condition for 'else'
-            self.control_stack.append(inverted.results[0])
-            for inner_op in false_block.ops:
-                self.translate_op(inner_op)
-            self.control_stack.pop()
-
-        elif isinstance(op, ReturnOp):
-            if op.operands:
-                q_val = self.emit_value(op.operands[0])
-                ret = ReturnOp(q_val)
-            else:
-                ret = ReturnOp([])
-            self.current_block.add_op(ret)
-        elif op.name in ("iarith.addi_imm", "iarith.subi_imm", "iarith.muli_imm", "iarith.divsi_imm"):
-            (lhs,) = op.operands
-            imm = int(op.imm.value.data)
-            q_lhs = self.emit_value(lhs)
-            opcode = {
-                "iarith.addi_imm": "add",
-                "iarith.subi_imm": "sub",
-                "iarith.muli_imm": "mul",
-                "iarith.divsi_imm": "div",
-            }[op.name]
+        reg = self.allocate_reg()
+        cmp_op.results[0].name_hint = f"q{reg}_0"
+        self.reg_ssa[reg] = cmp_op.results[0]
+        self.reg_version[reg] = 0
 
-            reg = self.allocate_reg()
-            new_op = self.create_binary_imm_op(opcode, q_lhs, imm)
-            self.current_block.add_op(new_op)
+        self.val_info[op.results[0]] = ValueInfo(reg, 0, ("cmpi", lhs, rhs, predicate))
 
-            new_op.results[0].name_hint = f"q{reg}_0"
-            self.reg_ssa[reg] = new_op.results[0]
-            self.reg_version[reg] = 0
-            self.val_info[op.results[0]] = ValueInfo(reg, 0, ("binaryimm", (opcode, lhs, imm)))
-
-        elif op.name == "arith.extui":
-            (src,) = op.operands
-            q_src = self.emit_value(src)
-            ctrl = self.get_current_control()
-            if ctrl is not None:
-                combined = self.combine_controls([ctrl, q_src])
-                res = self.emit_controlled_init(combined, 1)
-            else:
-                res = self.emit_controlled_init(q_src, 1)
-            reg = self.next_reg - 1
-            self.val_info[op.results[0]] = ValueInfo(reg, 0, ("extui", src))
-            return
+    def _translate_cond_br(self, op: Operation):
+        cond_val = self.emit_value(op.operands[0])
+        true_block = op.successors[0]
+        false_block = op.successors[1]
+
+        # Push condition for 'then'
+        self.control_stack.append(cond_val)
+        for inner_op in true_block.ops:
+            self.translate_op(inner_op)
+        self.control_stack.pop()
+
+        # Invert the condition using NOT
+        inverted = QNotOp(cond_val)
+        self.current_block.add_op(inverted)
 
+        inverted_reg = self.allocate_reg()
+        inverted.results[0].name_hint = f"q{inverted_reg}_0"
+        self.reg_version[inverted_reg] = 0
+        self.reg_ssa[inverted_reg] = inverted.results[0]
 
+
+        # Push inverted condition for 'else'
+        self.control_stack.append(inverted.results[0])
+        for inner_op in false_block.ops:
+            self.translate_op(inner_op)
+        self.control_stack.pop()
+
+    def _translate_return(self, op: Operation):
+        if op.operands:
+            q_val = self.emit_value(op.operands[0])
+            ret = ReturnOp(q_val)
         else:
-            raise NotImplementedError(f"Unsupported op {op.name}")
+            ret = ReturnOp([])
+        self.current_block.add_op(ret)
+
+    def _translate_binary_imm(self, op: Operation):
+        (lhs,) = op.operands
+        imm = int(op.imm.value.data)
+        q_lhs = self.emit_value(lhs)
+        opcode = _BINARY_IMM_OPCODES[op.name]
+
+        reg = self.allocate_reg()
+        new_op = self.create_binary_imm_op(opcode, q_lhs, imm)
+        self.current_block.add_op(new_op)
+
+        new_op.results[0].name_hint = f"q{reg}_0"
+        self.reg_ssa[reg] = new_op.results[0]
+        self.reg_version[reg] = 0
+        self.val_info[op.results[0]] = ValueInfo(reg, 0, ("binaryimm", (opcode, lhs, imm)))
+
+    def _translate_extui(self, op: Operation):
+        (src,) = op.operands
+        q_src = self.emit_value(src)
+        ctrl = self.get_current_control()
+        if ctrl is not None:
+            combined = self.combine_controls([ctrl, q_src])
+            res = self.emit_controlled_init(combined, 1)
+        else:
+            res = self.emit_controlled_init(q_src, 1)
+        reg = self.next_reg - 1
+        self.val_info[op.results[0]] = ValueInfo(reg, 0, ("extui", src))
+
+    # One dictionary lookup on ``op.name`` replaces the chain of ``isinstance``
+    # and name comparisons for every translated operation.
+    _op_handlers = {
+        ConstantOp.name: _translate_constant,
+        AddiOp.name: _translate_binary,
+        SubiOp.name: _translate_binary,
+        MuliOp.name: _translate_binary,
+        DivSIOp.name: _translate_binary,
+        "arith.cmpi": _translate_cmpi,
+        "cf.cond_br": _translate_cond_br,
+        ReturnOp.name: _translate_return,
+        "iarith.addi_imm": _translate_binary_imm,
+        "iarith.subi_imm": _translate_binary_imm,
+        "iarith.muli_imm": _translate_binary_imm,
+        "iarith.divsi_imm": _translate_binary_imm,
+        "arith.extui": _translate_extui,
+    }
 
 
     def get_current_control(self) -> SSAValue | None:
@@ -264,15 +297,10 @@ class QuantumTranslator:
 
     def create_controlled_op(self, opcode: str, lhs: SSAValue, rhs: SSAValue, ctrl: SSAValue) -> Operation:
         """Emit a controlled quantum operation."""
-        if opcode == "add":
-            return CQAddiOp(lhs, rhs, ctrl)
-        if opcode == "sub":
-            return CQSubiOp(lhs, rhs, ctrl)
-        if opcode == "mul":
-            return CQMuliOp(lhs, rhs, ctrl)
-        if opcode == "div":
-            return CQDivSOp(lhs, rhs, ctrl)
-        raise NotImplementedError(f"Unknown opcode for controlled op: {opcode}")
+        op_cls = _CONTROLLED_BINARY_OP_CLS.get(opcode)
+        if op_cls is None:
+            raise NotImplementedError(f"Unknown opcode for controlled op: {opcode}")
+        return op_cls(lhs, rhs, ctrl)
 
     # ------------------------------------------------------------------
     def translate(self) -> ModuleOp:
@@ -309,44 +337,53 @@ class QuantumTranslator:
 
     # ------------------------------------------------------------------
     def compute_cost(self, val: SSAValue) -> int:
-        """Recursively estimate the cost of recomputing ``val``."""
+        """Estimate the cost of recomputing ``val``."""
 
         # ``compute_cost`` is used to decide whether it is cheaper to recompute
-        # a value or to keep it alive in a register.  The method walks the
-        # expression tree that produced ``val`` and sums a simple cost metric.
-
-        # Memoize results so we do not recompute the same cost multiple times.
-        if val in self.cost_cache:
-            return self.cost_cache[val]
-
-        op = val.owner
-
-        # Constants are assumed to be very cheap to recreate.
-        if isinstance(op, ConstantOp):
-            cost = 1
-
-        # Binary arithmetic operations have a base cost of 1 plus the cost of
-        # recomputing both operands.
-        elif isinstance(op, (AddiOp, SubiOp, MuliOp, DivSIOp)):
-            cost = 1 + self.compute_cost(op.operands[0]) + self.compute_cost(op.operands[1])
+        # a value or to keep it alive in a register.  The cost of a value is 1
+        # plus the cost of every operand that would have to be recomputed with
+        # it.  The expression tree is walked with an explicit stack (children
+        # before parents) so long dependency chains cannot hit the recursion
+        # limit, and every value is costed once thanks to ``cost_cache``.
+        cache = self.cost_cache
+        if val in cache:
+            return cache[val]
+
+        stack = [val]
+        while stack:
+            current = stack[-1]
+            if current in cache:
+                stack.pop()
+                continue
+            operands = self._cost_operands(current.owner)
+            pending = [operand for operand in operands if operand not in cache]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            cache[current] = 1 + sum(cache[operand] for operand in operands)
+        return cache[val]
+
+    @staticmethod
+    def _cost_operands(op: Operation) -> Tuple[SSAValue, ...]:
+        """Return the operands of ``op`` that contribute to its recompute cost."""
+
+        # Binary arithmetic operations need both operands recomputed.
+        if isinstance(op, (AddiOp, SubiOp, MuliOp, DivSIOp)):
+            return (op.operands[0], op.operands[1])
 
         # Binary operations with an immediate operand only need to recompute the
         # non-immediate side.
-        elif op.name in (
+        if op.name in (
             "iarith.addi_imm",
             "iarith.subi_imm",
             "iarith.muli_imm",
             "iarith.divsi_imm",
         ):
-            cost = 1 + self.compute_cost(op.operands[0])
+            return (op.operands[0],)
 
-        # Fallback cost for any other operation type.
-        else:
-            cost = 1
-
-        # Store the computed cost in the cache and return it.
-        self.cost_cache[val] = cost
-        return cost
+        # Constants and any other operation type are leaves of cost 1.
+        return ()
 
     # ------------------------------------------------------------------
     def remaining_uses(self, val: SSAValue) -> int:
@@ -365,8 +402,10 @@ class QuantumTranslator:
         r = self.next_reg
         self.next_reg += 1
 
-        # Start the version counter for the new register at zero.
-        self.reg_version[r] = 0
+        # Start the version counter for the new register at zero; its SSA value
+        # is filled in by the caller once the producing op has been emitted.
+        self.reg_version.append(0)
+        self.reg_ssa.append(None)
         return r
 
     # ------------------------------------------------------------------
@@ -503,10 +542,17 @@ class QuantumTranslator:
     #     raise NotImplementedError
 
     def duplicate_value(self, val: SSAValue) -> SSAValue:
-        """Return a fresh register that is a copy of ``val`` using addi_imm 0."""
+        """Return a fresh register that is a copy of ``val``.
+
+        Constants are simply initialised again, which only costs X gates;
+        anything else is copied with ``addi_imm 0``.
+        """
         q_val = self.emit_value(val)
         reg = self.allocate_reg()
-        op = QAddiImmOp(q_val, 0)
+        if isinstance(q_val.owner, QuantumInitOp):
+            op = QuantumInitOp(q_val.owner.value)
+        else:
+            op = QAddiImmOp(q_val, 0)
         self.current_block.add_op(op)
         op.results[0].name_hint = f"q{reg}_0"
         self.reg_version[reg] = 0
@@ -519,15 +565,13 @@ class QuantumTranslator:
         ctrl = self.get_current_control()
 
         if ctrl is None:
-            if opcode == "add": return QAddiOp(lhs, rhs)
-            if opcode == "sub": return QSubiOp(lhs, rhs)
-            if opcode == "mul": return QMuliOp(lhs, rhs)
-            if opcode == "div": return QDivSOp(lhs, rhs)
+            op_cls = _BINARY_OP_CLS.get(opcode)
+            if op_cls is not None:
+                return op_cls(lhs, rhs)
         else:
-            if opcode == "add": return CQAddiOp(lhs, rhs, ctrl)
-            if opcode == "sub": return CQSubiOp(lhs, rhs, ctrl)
-            if opcode == "mul": return CQMuliOp(lhs, rhs, ctrl)
-            if opcode == "div": return CQDivSOp(lhs, rhs, ctrl)
+            op_cls = _CONTROLLED_BINARY_OP_CLS.get(opcode)
+            if op_cls is not None:
+                return op_cls(lhs, rhs, ctrl)
         raise NotImplementedError(opcode)
 
 
@@ -536,15 +580,13 @@ class QuantumTranslator:
         ctrl = self.get_current_control()
 
         if ctrl is None:
-            if opcode == "add": return QAddiImmOp(lhs, imm)
-            if opcode == "sub": return QSubiImmOp(lhs, imm)
-            if opcode == "mul": return QMuliImmOp(lhs, imm)
-            if opcode == "div": return QDivSImmOp(lhs, imm)
+            op_cls = _BINARY_IMM_OP_CLS.get(opcode)
+            if op_cls is not None:
+                return op_cls(lhs, imm)
         else:
-            if opcode == "add": return CQAddiImmOp(lhs, imm, ctrl)
-            if opcode == "sub": return CQSubiImmOp(lhs, imm, ctrl)
-            if opcode == "mul": return CQMuliImmOp(lhs, imm, ctrl)
-            if opcode == "div": return CQDivSImmOp(lhs, imm, ctrl)
+            op_cls = _CONTROLLED_BINARY_IMM_OP_CLS.get(opcode)
+            if op_cls is not None:
+                return op_cls(lhs, imm, ctrl)
 
         raise NotImplementedError(f"Unknown opcode for immediate binary op: {opcode}")
 
@@ -568,146 +610,10 @@ class QuantumTranslator:
             for res in op.results:
                 self.compute_cost(res)
 
-        # ``remaining`` tracks how many uses of each SSA value remain while we
-        # traverse the block.  Start with the global use counts.
-        remaining = {val: len(val.uses) for val in self.use_count}
-
-        # Translate each operation in order.
+        # Translate each operation in order.  Top-level operations go through
+        # the same handlers as the bodies of conditional branches.
         for op in block.ops:
-            if isinstance(op, ConstantOp):
-                # Constants simply allocate a new register and initialize it.
-                reg = self.allocate_reg()
-                init_op = QuantumInitOp(op.value.value.data)
-                self.current_block.add_op(init_op)
-                init_op.results[0].name_hint = f"q{reg}_0"
-                self.val_info[op.results[0]] = ValueInfo(reg, 0, ("const", op.value.value.data))
-                self.reg_ssa[reg] = init_op.results[0]
-
-            elif isinstance(op, (AddiOp, SubiOp, MuliOp, DivSIOp)):
-                # Binary arithmetic operation with two SSA operands.
-                lhs, rhs = op.operands
-
-                # Update use counts for the operands.
-                remaining[lhs] -= 1
-                remaining[rhs] -= 1
-
-                # Materialize operand values.
-                q_lhs = self.emit_value(lhs)
-                q_rhs = self.emit_value(rhs)
-                if q_lhs is q_rhs:
-                    q_rhs = self.duplicate_value(rhs)
-
-                # Determine opcode string.
-                opcode = {
-                    AddiOp: "add",
-                    SubiOp: "sub",
-                    MuliOp: "mul",
-                    DivSIOp: "div",
-                }[type(op)]
-
-                # Allocate a new register for the result and emit the op.
-                reg = self.allocate_reg()
-                new_op = self.create_binary_op(opcode, q_lhs, q_rhs)
-                self.current_block.add_op(new_op)
-
-                # Record the new register.
-                new_op.results[0].name_hint = f"q{reg}_0"
-                self.reg_ssa[reg] = new_op.results[0]
-                self.val_info[op.results[0]] = ValueInfo(reg, 0, ("binary", (opcode, lhs, rhs)))
-
-            elif op.name in ("iarith.addi_imm", "iarith.subi_imm", "iarith.muli_imm", "iarith.divsi_imm"):
-                # Binary operation where one operand is an immediate integer.
-                (lhs,) = op.operands
-                imm = int(op.imm.value.data)
-                remaining[lhs] -= 1
-                q_lhs = self.emit_value(lhs)
-                opcode = {
-                    "iarith.addi_imm": "add",
-                    "iarith.subi_imm": "sub",
-                    "iarith.muli_imm": "mul",
-                    "iarith.divsi_imm": "div",
-                }[op.name]
-
-                # Allocate a new register for the result.
-                reg = self.allocate_reg()
-                new_op = self.create_binary_imm_op(opcode, q_lhs, imm)
-                self.current_block.add_op(new_op)
-
-                new_op.results[0].name_hint = f"q{reg}_0"
-                self.reg_ssa[reg] = new_op.results[0]
-                self.val_info[op.results[0]] = ValueInfo(reg, 0, ("binaryimm", (opcode, lhs, imm)))
-            
-            elif op.name == "cf.cond_br":
-                cond_val = self.emit_value(op.operands[0])
-                true_block = op.successors[0]
-                false_block = op.successors[1]
-
-                # Push condition for 'then'
-                self.control_stack.append(cond_val)
-                for inner_op in true_block.ops:
-                    self.translate_op(inner_op)
-                self.control_stack.pop()
-
-                # Invert the control for 'else'
-                inverted_reg = self.allocate_reg()
-                false_ctrl = self.emit_value(op.operands[0])
-                # Invert control using: not x ≈ x xor 1
-                inverted = QNotOp(cond_val)
-                self.current_block.add_op(inverted)
-                inverted_reg = self.allocate_reg()
-                inverted.results[0].name_hint = f"q{inverted_reg}_0"
-                self.reg_version[inverted_reg] = 0
-                self.reg_ssa[inverted_reg] = inverted.results[0]
-
-
-                # Push inverted condition for 'else'
-                self.control_stack.append(inverted.results[0])
-                for inner_op in false_block.ops:
-                    self.translate_op(inner_op)
-                self.control_stack.pop()
-
-
-            elif isinstance(op, ReturnOp):
-                # Return statements are forwarded directly after materializing
-                # the returned value.
-                if op.operands:
-                    q_val = self.emit_value(op.operands[0])
-                    ret = ReturnOp(q_val)
-                else:
-                    ret = ReturnOp([])
-                self.current_block.add_op(ret)
-            
-            elif op.name == "arith.cmpi":
-                lhs, rhs = op.operands
-                predicate = int(op.predicate.value.data)
-                q_lhs = self.emit_value(lhs)
-                q_rhs = self.emit_value(rhs)
-                reg = self.allocate_reg()
-                cmp_op = QCmpiOp(q_lhs, q_rhs, predicate)
-                self.current_block.add_op(cmp_op)
-                cmp_op.results[0].name_hint = f"q{reg}_0"
-                self.val_info[op.results[0]] = ValueInfo(reg, 0, ("cmpi", lhs, rhs, predicate))
-                self.reg_ssa[reg] = cmp_op.results[0]
-
-            elif op.name == "arith.extui":
-                (src,) = op.operands
-                remaining[src] -= 1
-                q_src = self.emit_value(src)
-                ctrl = self.get_current_control()
-                if ctrl is not None:
-                    combined = self.combine_controls([ctrl, q_src])
-                    res = self.emit_controlled_init(combined, 1)
-                else:
-                    res = self.emit_controlled_init(q_src, 1)
-                reg = self.next_reg - 1
-                self.val_info[op.results[0]] = ValueInfo(reg, 0, ("extui", src))
-                self.reg_ssa[reg] = res
-
-
-
-            else:
-                # Any other operation is currently unsupported.
-                raise NotImplementedError(f"Unsupported op {op.name}")
+            self.translate_op(op)
 
         # Construct the function with the same signature as the original but
         # containing the newly built block of quantum operations.
@@ -1,7 +1,10 @@
 """Utility functions implementing arithmetic and comparison on quantum data."""
 
+from functools import lru_cache
+
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, transpile
-from qiskit.circuit.library.standard_gates import PhaseGate
+from qiskit.circuit.library.standard_gates import MCPhaseGate
+from qiskit.circuit.exceptions import CircuitError
 from qiskit.circuit.library import QFT, RGQFTMultiplier
 from qiskit.providers.basic_provider import BasicSimulator
 import numpy as np
@@ -12,6 +15,26 @@ except Exception:  # pragma: no cover - optional dependency
 
 NUMBER_OF_BITS = 4
 
+# Basis the cached arithmetic gates are compiled to.  Aer executes these
+# natively and they map one-to-one onto the ``u1/u2/u3/cx`` export basis.
+GATE_BASIS = ["cx", "u", "h", "p"]
+
+
+@lru_cache(maxsize=64)
+def _qft_instr(n):
+    """Return the (swap-free) QFT on ``n`` qubits as a reusable instruction.
+
+    Building a ``QFT`` circuit and converting it is far more expensive than
+    appending an existing instruction, so every width is built only once.
+    """
+    return QFT(n, do_swaps=False).to_gate()
+
+
+@lru_cache(maxsize=64)
+def _iqft_instr(n):
+    """Return the inverse of :func:`_qft_instr` for ``n`` qubits."""
+    return QFT(n, do_swaps=False).inverse().to_gate()
+
 def unique_reg_name(existing_names, base):
     """
     Generate a unique register name not in existing_names starting from base.
@@ -22,6 +45,29 @@ def unique_reg_name(existing_names, base):
     return f"{base}{idx}"
 
 
+def _fresh_register(qc, size, prefix):
+    """Add a new ``size``-qubit register named ``<prefix><k>`` to ``qc``.
+
+    A per-prefix counter is stored on the circuit so that each allocation is
+    O(1) instead of rescanning every register name.  If the candidate name was
+    already taken by someone else (e.g. an explicitly named register) the next
+    index is tried.
+    """
+    counters = getattr(qc, "_qarith_counters", None)
+    if counters is None:
+        counters = qc._qarith_counters = {}
+    idx = counters.get(prefix, 0)
+    while True:
+        reg = QuantumRegister(size, name=f"{prefix}{idx}")
+        idx += 1
+        try:
+            qc.add_register(reg)
+        except CircuitError:
+            continue
+        counters[prefix] = idx
+        return reg
+
+
 def set_number_of_bits(n):
     """
     Set the number of bits for two's complement representation.
@@ -41,8 +87,7 @@ def int_to_twos_complement(value):
     Convert an integer to its two's complement binary representation.
     Returns a list of bits (0 or 1), least significant bit first.
     """
-    if value < 0:
-        value = (1 << NUMBER_OF_BITS) + value
+    value &= (1 << NUMBER_OF_BITS) - 1
     return [(value >> i) & 1 for i in range(NUMBER_OF_BITS)]
 
 def initialize_variable(qc, value, register_name=None):
@@ -71,24 +116,215 @@ def initialize_variable(qc, value, register_name=None):
         )
 
     if register_name is None:
-        base_name = "qr"
-        index = 0
-        existing_names = {reg.name for reg in qc.qregs}
-        while f"{base_name}{index}" in existing_names:
-            index += 1
-        register_name = f"{base_name}{index}"
-
-    new_qreg = QuantumRegister(NUMBER_OF_BITS, name=register_name)
-    qc.add_register(new_qreg)
-
-    binary_value = int_to_twos_complement(value)
+        new_qreg = _fresh_register(qc, NUMBER_OF_BITS, "qr")
+    else:
+        new_qreg = QuantumRegister(NUMBER_OF_BITS, name=register_name)
+        qc.add_register(new_qreg)
 
-    for i, bit in enumerate(binary_value):
-        if bit == 1:
+    bits = value & ((1 << NUMBER_OF_BITS) - 1)
+    for i in range(NUMBER_OF_BITS):
+        if (bits >> i) & 1:
             qc.x(new_qreg[i])
 
     return new_qreg
 
+@lru_cache(maxsize=64)
+def _angle_pairs(n):
+    """Return the ``(i, j, angle)`` rotations of an ``n``-qubit Draper adder.
+
+    ``angle`` is the phase ``2π / 2**(i - j + 1)`` that control bit ``j``
+    applies to target qubit ``i`` (for ``j <= i``).
+    """
+    return tuple(
+        (i, j, (2 * np.pi) / (2 ** (i - j + 1)))
+        for i in range(n)
+        for j in range(i + 1)
+    )
+
+
+def _phase_angle(value, k):
+    """Return ``2π * value / 2**k`` reduced to ``[0, 2π)``.
+
+    The reduction is done on integers, so multiples of ``2π`` come out as an
+    exact ``0.0`` and the corresponding gate can be skipped.
+    """
+    modulus = 1 << k
+    return (2 * np.pi * (value % modulus)) / modulus
+
+
+@lru_cache(maxsize=None)
+def _ccphase_gate(exponent):
+    """Return a doubly controlled phase gate of angle ``2π / 2**exponent``.
+
+    :func:`mul` only ever needs the ``n`` distinct angles ``π, π/2, ...``, so
+    each one is built once and then appended wherever it is needed.
+    """
+    return MCPhaseGate((2 * np.pi) / (2 ** exponent), 2)
+
+
+@lru_cache(maxsize=64)
+def _mul_schedule(n):
+    """Return the ``(p, q, k, gate)`` rotations of an ``n``-bit :func:`mul`.
+
+    For every bit ``a[p]`` the multiplier adds ``b << p`` into the output in
+    the Fourier basis.  Partial products with ``p + q >= n`` fall outside the
+    ``n``-bit result, and output qubits ``k < p + q`` would only receive
+    multiples of 2π, so only the contributing triples are listed.
+    """
+    return tuple(
+        (p, q, k, _ccphase_gate(k + 1 - p - q))
+        for p in range(n)
+        for q in range(n - p)
+        for k in range(p + q, n)
+    )
+
+
+@lru_cache(maxsize=1024)
+def _addi_schedule(value, n):
+    """Return the non-zero ``(j, angle)`` rotations adding ``value`` to ``n`` qubits.
+
+    ``value`` should be reduced modulo ``2**n`` so that equivalent immediates
+    share an entry; :func:`_phase_angle` reduces modulo ``2**(j + 1)``, which
+    already gives the two's complement encoding on the register width.
+    For ``value == 1`` this is simply ``2π / 2**(j + 1)`` on every qubit.
+    """
+    schedule = []
+    for j in range(n):
+        angle = _phase_angle(value, j + 1)
+        if angle:
+            schedule.append((j, angle))
+    return tuple(schedule)
+
+
+def _phase_add_classical(qc, qreg, value):
+    """Add the classical ``value`` to ``qreg``, which must already be in the
+    Fourier basis (i.e. between :func:`_qft_instr` and :func:`_iqft_instr`).
+    """
+    n = len(qreg)
+    for j, angle in _addi_schedule(value % (1 << n), n):
+        qc.p(angle, qreg[j])
+
+
+def _phase_add_classical_controlled(qc, qreg, value, control):
+    """Like :func:`_phase_add_classical` but only when ``control`` is ``|1>``."""
+    n = len(qreg)
+    for j, angle in _addi_schedule(value % (1 << n), n):
+        qc.cp(angle, control, qreg[j])
+
+
+def _phase_add_controlled(qc, qreg, ctrl_reg, sign=1):
+    """Add (``sign=1``) or subtract (``sign=-1``) ``ctrl_reg`` to ``qreg``,
+    which must already be in the Fourier basis.
+    """
+    for i, j, angle in _angle_pairs(len(qreg)):
+        qc.cp(sign * angle, ctrl_reg[j], qreg[i])
+
+def _compiled_gate(circ):
+    """Turn ``circ`` into a gate whose definition is already in :data:`GATE_BASIS`.
+
+    The arithmetic gates are cached and appended many times, so compiling
+    them once here means transpiling a full program only has to inline them
+    instead of re-synthesising every QFT and controlled phase per occurrence.
+    """
+    compiled = transpile(circ, basis_gates=GATE_BASIS, optimization_level=1)
+    compiled.name = circ.name
+    return compiled.to_gate()
+
+
+def _phase_add_pair(qc, qreg, a_reg, b_reg, b_sign=1):
+    """Add ``a_reg`` and ``b_sign * b_reg`` to ``qreg`` in the Fourier basis.
+
+    Both operands share the rotation table, so they are emitted in a single
+    pass instead of two calls to :func:`_phase_add_controlled`.
+    """
+    for i, j, angle in _angle_pairs(len(qreg)):
+        target = qreg[i]
+        qc.cp(angle, a_reg[j], target)
+        qc.cp(b_sign * angle, b_reg[j], target)
+
+
+@lru_cache(maxsize=64)
+def _add_gate(n, sign=1):
+    """Return ``a += sign * b`` on two ``n``-qubit registers as one gate.
+
+    The in-place adders are called repeatedly (``divu`` runs two of them per
+    quotient bit), so they are synthesised once per width and appended as a
+    single opaque instruction on qubits ``a + b``.
+    """
+    a = QuantumRegister(n, "a")
+    b = QuantumRegister(n, "b")
+    circ = QuantumCircuit(a, b, name=f"add{n}" if sign > 0 else f"sub{n}")
+    circ.append(_qft_instr(n), a)
+    _phase_add_controlled(circ, a, b, sign=sign)
+    circ.append(_iqft_instr(n), a)
+    return _compiled_gate(circ)
+
+
+@lru_cache(maxsize=64)
+def _controlled_add_gate(n):
+    """Return ``a += b`` on qubits ``[control] + a + b`` as one gate."""
+    ctrl = QuantumRegister(1, "c")
+    a = QuantumRegister(n, "a")
+    b = QuantumRegister(n, "b")
+    circ = QuantumCircuit(ctrl, a, b, name=f"cadd{n}")
+    circ.append(_qft_instr(n), a)
+    for i, j, angle in _angle_pairs(n):
+        circ.mcp(angle, [ctrl[0], b[j]], a[i])
+    circ.append(_iqft_instr(n), a)
+    return _compiled_gate(circ)
+
+
+@lru_cache(maxsize=256)
+def _controlled_addi_gate(n, value):
+    """Return ``a += value`` on qubits ``[control] + a`` as one gate.
+
+    ``value`` is expected to be reduced modulo ``2**n`` by the caller so that
+    equivalent immediates share a cache entry.
+    """
+    ctrl = QuantumRegister(1, "c")
+    a = QuantumRegister(n, "a")
+    circ = QuantumCircuit(ctrl, a, name=f"caddi{n}_{value}")
+    circ.append(_qft_instr(n), a)
+    _phase_add_classical_controlled(circ, a, value, ctrl[0])
+    circ.append(_iqft_instr(n), a)
+    return _compiled_gate(circ)
+
+
+@lru_cache(maxsize=64)
+def _controlled_invert_gate(n):
+    """Return ``a = -a`` on qubits ``[control] + a`` as one gate.
+
+    The bitwise NOT and the Fourier-basis ``+1`` are emitted together, so
+    the controlled negation used by the sign/magnitude conversions is a
+    single cached instruction.
+    """
+    ctrl = QuantumRegister(1, "c")
+    a = QuantumRegister(n, "a")
+    circ = QuantumCircuit(ctrl, a, name=f"cneg{n}")
+    for qubit in a:
+        circ.cx(ctrl[0], qubit)
+    circ.append(_qft_instr(n), a)
+    _phase_add_classical_controlled(circ, a, 1, ctrl[0])
+    circ.append(_iqft_instr(n), a)
+    return _compiled_gate(circ)
+
+
+@lru_cache(maxsize=64)
+def _sign_restore_gate(n):
+    """Return the divider sign fix-up on qubits ``[sign] + reg`` as one gate.
+
+    ``reg`` is converted from sign+magnitude back to two's complement and the
+    sign flag is then cleared again from the result's MSB, the pattern closing
+    every signed division for the quotient and the operands.
+    """
+    sign = QuantumRegister(1, "s")
+    reg = QuantumRegister(n, "r")
+    circ = QuantumCircuit(sign, reg, name=f"signfix{n}")
+    circ.append(_controlled_invert_gate(n), [sign[0], *reg])
+    circ.cx(reg[n - 1], sign[0])
+    return _compiled_gate(circ)
+
+
 def add_in_place(qc, a_reg, b_reg):
     """
     Add two quantum registers using a quantum circuit.
@@ -102,46 +338,23 @@ def add_in_place(qc, a_reg, b_reg):
         QuantumRegister: The quantum register containing the result of the addition.
     """
 
-    # Apply QFT to a
-    qc.append(QFT(NUMBER_OF_BITS, do_swaps=False), a_reg)
-
-    # Add b into a using controlled phase gates
-    for i in range(NUMBER_OF_BITS):
-        for j in range(NUMBER_OF_BITS):
-            if j <= i:
-                angle = (2 * np.pi) / (2 ** (i - j + 1))
-                qc.cp(angle, b_reg[j], a_reg[i])
-
-    # Apply inverse QFT
-    qc.append(QFT(NUMBER_OF_BITS, do_swaps=False).inverse(), a_reg)
+    # QFT, controlled phase additions of b and inverse QFT as one gate
+    qc.append(_add_gate(len(a_reg)), [*a_reg, *b_reg])
     return a_reg
 
 def add(qc, a_reg, b_reg):
     n = len(a_reg)
 
-    # Generate a unique name
-    existing_names = {reg.name for reg in qc.qregs}
-    index = 0
-    while f"sum{index}" in existing_names:
-        index += 1
-    sum_name = f"sum{index}"
-
-    s_reg = QuantumRegister(n, name=sum_name)
-    qc.add_register(s_reg)
+    s_reg = _fresh_register(qc, n, "sum")
 
     # Apply QFT to s_reg (output register)
-    qc.append(QFT(n, do_swaps=False), s_reg)
+    qc.append(_qft_instr(n), s_reg)
 
     # Apply controlled phase gates from a_reg and b_reg into s_reg
-    for i in range(n):
-        for j in range(n):
-            if j <= i:
-                angle = 2 * np.pi / (2 ** (i - j + 1))
-                qc.cp(angle, a_reg[j], s_reg[i])
-                qc.cp(angle, b_reg[j], s_reg[i])
+    _phase_add_pair(qc, s_reg, a_reg, b_reg)
 
     # Inverse QFT
-    qc.append(QFT(n, do_swaps=False).inverse(), s_reg)
+    qc.append(_iqft_instr(n), s_reg)
 
     return s_reg
 
@@ -157,22 +370,13 @@ def addi_in_place(qc, qreg, b):
     Returns:
         QuantumRegister: The quantum register containing the result of the addition.
     """
-    b_bin = int_to_twos_complement(b)
-    qc.append(QFT(num_qubits=NUMBER_OF_BITS, do_swaps=False), qreg)
+    qc.append(_qft_instr(NUMBER_OF_BITS), qreg)
 
-    # Add classical value b (2's complement) via controlled phase rotations
-    b_int = int(''.join(str(x) for x in b_bin[::-1]), 2)
-    if b >= 0:
-        b_val = b_int
-    else:
-        b_val = b_int - (1 << NUMBER_OF_BITS) 
-
-    for j in range(NUMBER_OF_BITS):
-        angle = (b_val * 2 * np.pi) / (2 ** (j + 1))
-        qc.p(angle, qreg[j])
+    # Add classical value b (2's complement) via phase rotations
+    _phase_add_classical(qc, qreg, b)
 
     # Apply inverse QFT
-    qc.append(QFT(num_qubits=NUMBER_OF_BITS, do_swaps=False).inverse(), qreg)
+    qc.append(_iqft_instr(NUMBER_OF_BITS), qreg)
     return qreg
 
 def invert(qc, qreg):
@@ -187,12 +391,16 @@ def invert(qc, qreg):
     Returns:
         QuantumRegister: The modified quantum register (now contains -x).
     """
+    n = len(qreg)
+
     # Step 1: Bitwise NOT (apply X to every qubit)
     for qubit in qreg:
         qc.x(qubit)
 
-    # Step 2: Add 1 using addi()
-    addi_in_place(qc, qreg, 1)
+    # Step 2: Add 1 in the Fourier basis of qreg
+    qc.append(_qft_instr(n), qreg)
+    _phase_add_classical(qc, qreg, 1)
+    qc.append(_iqft_instr(n), qreg)
 
     return qreg
 
@@ -211,34 +419,19 @@ def addi(qc, a_reg, b):
         QuantumRegister: A new quantum register containing the result (a + b).
     """
     n = len(a_reg)
-    existing = {reg.name for reg in qc.qregs}
-    idx = 0
-    while f"sum{idx}" in existing:
-        idx += 1
-    s_reg = QuantumRegister(n, name=f"sum{idx}")
-    qc.add_register(s_reg)
+    s_reg = _fresh_register(qc, n, "sum")
 
     # Apply QFT to s_reg (output register)
-    qc.append(QFT(n, do_swaps=False), s_reg)
+    qc.append(_qft_instr(n), s_reg)
 
     # Add classical value b via phase rotations to s_reg
-    b_bin = int_to_twos_complement(b)
-    b_int = int(''.join(str(x) for x in b_bin[::-1]), 2)
-    b_val = b_int if b >= 0 else b_int - (1 << n)
-
-    for j in range(n):
-        angle = (b_val * 2 * np.pi) / (2 ** (j + 1))
-        qc.p(angle, s_reg[j])
+    _phase_add_classical(qc, s_reg, b)
 
     # Add a_reg to s_reg via controlled rotations
-    for i in range(n):
-        for j in range(n):
-            if j <= i:
-                angle = 2 * np.pi / (2 ** (i - j + 1))
-                qc.cp(angle, a_reg[j], s_reg[i])
+    _phase_add_controlled(qc, s_reg, a_reg)
 
     # Inverse QFT
-    qc.append(QFT(n, do_swaps=False).inverse(), s_reg)
+    qc.append(_iqft_instr(n), s_reg)
 
     return s_reg
 
@@ -246,8 +439,11 @@ def addi(qc, a_reg, b):
 
 def sub(qc, a_reg, b_reg):
     """
-    Subtract the contents of b_reg from a_reg using two's complement:
-    a - b = a + (-b)
+    Subtract the contents of b_reg from a_reg into a new register.
+
+    Both operands are accumulated into the output while it stays in the
+    Fourier basis: ``a`` with positive and ``b`` with negated phase rotations,
+    so only one QFT pair is emitted and ``b_reg`` is never touched.
 
     Args:
         qc (QuantumCircuit): The quantum circuit to modify.
@@ -255,17 +451,16 @@ def sub(qc, a_reg, b_reg):
         b_reg (QuantumRegister): The subtrahend register (b).
     
     Returns:
-        QuantumRegister: The register containing the result (in a_reg).
+        QuantumRegister: A new register containing the result (a - b).
     """
-    # Invert the sign of b (i.e., compute -b)
-    invert(qc, b_reg)
+    n = len(a_reg)
+    s_reg = _fresh_register(qc, n, "sum")
 
-    # Add -b to a
-    result = add(qc, a_reg, b_reg)
+    qc.append(_qft_instr(n), s_reg)
+    _phase_add_pair(qc, s_reg, a_reg, b_reg, b_sign=-1)
+    qc.append(_iqft_instr(n), s_reg)
 
-    # Invert the sign of b back to its original value
-    invert(qc, b_reg)
-    return result
+    return s_reg
 
 def subi(qc, qreg, b):
     """
@@ -295,12 +490,7 @@ def twos_to_sign_magnitude(qc, qreg):
     """
 
     n = len(qreg)
-    existing = {reg.name for reg in qc.qregs}
-    idx = 0
-    while f"sign{idx}" in existing:
-        idx += 1
-    sign = QuantumRegister(1, name=f"sign{idx}")
-    qc.add_register(sign)
+    sign = _fresh_register(qc, 1, "sign")
 
     qc.cx(qreg[n - 1], sign[0])
     _controlled_invert_in_place(qc, qreg, sign[0])
@@ -336,26 +526,17 @@ def mul(qc, a_reg, b_reg):
         QuantumRegister: New n-bit register with the product modulo 2^n.
     """
     n = len(a_reg)
-    existing = {reg.name for reg in qc.qregs}
-    idx = 0
-    while f"prod{idx}" in existing:
-        idx += 1
-    out_reg = QuantumRegister(n, name=f"prod{idx}")
-    qc.add_register(out_reg)
+    out_reg = _fresh_register(qc, n, "prod")
 
     # QFT on output
-    qc.append(QFT(n, do_swaps=False), out_reg)
+    qc.append(_qft_instr(n), out_reg)
 
     # Controlled-controlled-phase rotations (truncated to n-bit result)
-    for j in range(1, n + 1):
-        for i in range(1, n + 1):
-            for k in range(1, n + 1):  # ⬅️ Only n bits in the result
-                lam = (2 * np.pi) / (2 ** (i + j + k - 2 * n))
-                if lam != 0:
-                    qc.append(PhaseGate(lam).control(2), [a_reg[n - j], b_reg[n - i], out_reg[k - 1]])
+    for p, q, k, gate in _mul_schedule(n):
+        qc.append(gate, [a_reg[p], b_reg[q], out_reg[k]])
 
     # Inverse QFT
-    qc.append(QFT(n, do_swaps=False).inverse(), out_reg)
+    qc.append(_iqft_instr(n), out_reg)
 
     return out_reg
 
@@ -377,35 +558,62 @@ def muli(qc, a_reg, c, n_output_bits=None):
     if n_output_bits is None:
         n_output_bits = n
 
-    existing = {reg.name for reg in qc.qregs}
-    idx = 0
-    while f"prod{idx}" in existing:
-        idx += 1
-    out_reg = QuantumRegister(n_output_bits, name=f"prod{idx}")
-    qc.add_register(out_reg)
+    out_reg = _fresh_register(qc, n_output_bits, "prod")
+
+    # Constants that are 0 or ±2**k modulo 2**n_output_bits need no
+    # multiplier: the product is empty, or a shifted copy of a_reg that is
+    # negated afterwards when the constant is negative.
+    modulus = 1 << n_output_bits
+    if c % modulus == 0:
+        return out_reg
+    for magnitude, negate in ((c % modulus, False), (-c % modulus, True)):
+        if magnitude & (magnitude - 1) == 0:
+            shift = magnitude.bit_length() - 1
+            for i in range(shift, min(n + shift, n_output_bits)):
+                qc.cx(a_reg[i - shift], out_reg[i])
+            if negate:
+                invert(qc, out_reg)
+            return out_reg
 
     # QFT
-    qc.append(QFT(n_output_bits, do_swaps=False), out_reg)
+    qc.append(_qft_instr(n_output_bits), out_reg)
 
-    # Phase logic
-    abs_c = abs(c)
+    # Phase logic: add c * 2**j for every set bit a_j.  A negative c is
+    # handled by the modular reduction of the angles, so no separate
+    # negation pass is needed afterwards.
     for j in range(n):
         for k in range(n_output_bits):
-            angle = (2 * np.pi * abs_c * (2 ** j)) / (2 ** (k + 1))
-            angle = angle % (2 * np.pi)
-            if angle != 0:
+            angle = _phase_angle(c << j, k + 1)
+            if angle:
                 qc.cp(angle, a_reg[j], out_reg[k])
 
     # Inverse QFT
-    qc.append(QFT(n_output_bits, do_swaps=False).inverse(), out_reg)
-
-    # Sign correction
-    if c < 0:
-        invert(qc, out_reg)
+    qc.append(_iqft_instr(n_output_bits), out_reg)
 
     return out_reg
 
 
+def _restore_qubit_order(qc, reg, order):
+    """Swap qubits so that bit ``k`` held by ``order[k]`` ends up in ``reg[k]``.
+
+    The dividers shift their remainder by relabeling qubits instead of
+    emitting SWAP chains; this puts the bits back in register order at the
+    end (no gates at all when the relabeling wrapped around completely).
+    """
+    order = list(order)
+    position = {qubit: k for k, qubit in enumerate(order)}
+    for k, qubit in enumerate(reg):
+        current = order[k]
+        if current is qubit:
+            continue
+        # Bit k lives on ``current``; whichever bit lives on ``qubit`` moves
+        # to ``current`` after the swap.
+        other = position[qubit]
+        qc.swap(current, qubit)
+        order[other], order[k] = current, qubit
+        position[current], position[qubit] = other, k
+
+
 def divu(qc, a_reg, b_reg, n_output_bits=None):
     """
     Divide unsigned ``a_reg`` by unsigned ``b_reg`` using restoring division.
@@ -429,37 +637,27 @@ def divu(qc, a_reg, b_reg, n_output_bits=None):
         n_output_bits = n
 
     # Allocate quotient register
-    existing = {reg.name for reg in qc.qregs}
-    idx = 0
-    while (
-        f"quotu{idx}" in existing
-        or f"rem{idx}" in existing
-        or f"sign{idx}" in existing
-    ):
-        idx += 1
-    qout = QuantumRegister(n_output_bits, name=f"quotu{idx}")
-    qc.add_register(qout)
+    qout = _fresh_register(qc, n_output_bits, "quotu")
 
     # Allocate remainder and sign ancilla
-    rem = QuantumRegister(n, name=f"rem{idx}")
-    sign = QuantumRegister(1, name=f"sign{idx}")
-    qc.add_register(rem)
-    qc.add_register(sign)
+    rem = _fresh_register(qc, n, "rem")
+    sign = _fresh_register(qc, 1, "sign")
 
-    # Begin restoring division algorithm
+    # Begin restoring division algorithm.  ``rem_q`` lists the qubit holding
+    # each remainder bit (LSB first), so shifting is a relabeling.
+    rem_q = list(rem)
     for i in reversed(range(n_output_bits)):
         # Shift remainder left by 1
-        for j in reversed(range(1, n)):
-            qc.swap(rem[j], rem[j - 1])
+        rem_q.insert(0, rem_q.pop())
         if i < n:
-            qc.swap(rem[0], a_reg[i])
+            qc.swap(rem_q[0], a_reg[i])
 
         # Subtract b from rem
-        _sub_in_place(qc, rem, b_reg)
+        _sub_in_place(qc, rem_q, b_reg)
 
         # If result was negative, restore (conditionally add back)
-        qc.cx(rem[n - 1], sign[0])  # MSB is 1 → negative
-        _controlled_add_in_place(qc, rem, b_reg, sign[0])
+        qc.cx(rem_q[n - 1], sign[0])  # MSB is 1 → negative
+        _controlled_add_in_place(qc, rem_q, b_reg, sign[0])
 
         # Set quotient bit
         qc.x(qout[i])
@@ -469,6 +667,7 @@ def divu(qc, a_reg, b_reg, n_output_bits=None):
         qc.cx(qout[i], sign[0])
         qc.x(sign[0])
 
+    _restore_qubit_order(qc, rem, rem_q)
     return qout, rem
 
 
@@ -495,34 +694,21 @@ def divui(qc, a_reg, divisor, n_output_bits=None):
     if n_output_bits is None:
         n_output_bits = n
 
-    existing = {reg.name for reg in qc.qregs}
-    idx = 0
-    while (
-        f"quotu{idx}" in existing
-        or f"rem{idx}" in existing
-        or f"sign{idx}" in existing
-    ):
-        idx += 1
-    qout = QuantumRegister(n_output_bits, name=f"quotu{idx}")
-    qc.add_register(qout)
-
-    rem = QuantumRegister(n, name=f"rem{idx}")
-    qc.add_register(rem)
-
-    sign = QuantumRegister(1, name=f"sign{idx}")
-    qc.add_register(sign)
+    qout = _fresh_register(qc, n_output_bits, "quotu")
+    rem = _fresh_register(qc, n, "rem")
+    sign = _fresh_register(qc, 1, "sign")
 
+    rem_q = list(rem)
     for i in reversed(range(n_output_bits)):
-        for j in reversed(range(1, n)):
-            qc.swap(rem[j], rem[j - 1])
+        rem_q.insert(0, rem_q.pop())
         if i < n:
-            qc.swap(rem[0], a_reg[i])
+            qc.swap(rem_q[0], a_reg[i])
 
-        addi_in_place(qc, rem, -divisor)
+        addi_in_place(qc, rem_q, -divisor)
 
-        qc.cx(rem[n - 1], sign[0])
+        qc.cx(rem_q[n - 1], sign[0])
 
-        _controlled_addi_in_place(qc, rem, divisor, sign[0])
+        _controlled_addi_in_place(qc, rem_q, divisor, sign[0])
 
         qc.x(qout[i])
         qc.cx(sign[0], qout[i])
@@ -530,6 +716,7 @@ def divui(qc, a_reg, divisor, n_output_bits=None):
         qc.cx(qout[i], sign[0])
         qc.x(sign[0])
 
+    _restore_qubit_order(qc, rem, rem_q)
     return qout, rem
 
 
@@ -570,26 +757,18 @@ def div(qc, a_reg, b_reg, n_output_bits=None):
     qout, rem = divu(qc, a_reg, b_reg, n_output_bits=n_output_bits)
 
     # Compute quotient sign (XOR of input signs)
-    existing = {reg.name for reg in qc.qregs}
-    idx = 0
-    while f"signq{idx}" in existing:
-        idx += 1
-    sign_q = QuantumRegister(1, name=f"signq{idx}")
-    qc.add_register(sign_q)
+    sign_q = _fresh_register(qc, 1, "signq")
     qc.cx(sign_a[0], sign_q[0])
     qc.cx(sign_b[0], sign_q[0])
 
     # Convert quotient and remainder back to two's complement
-    sign_magnitude_to_twos(qc, qout, sign_q)
-    qc.cx(qout[n_output_bits - 1], sign_q[0])
+    qc.append(_sign_restore_gate(n_output_bits), [sign_q[0], *qout])
 
     sign_magnitude_to_twos(qc, rem, sign_a)
 
     # Restore original a and b from sign+magnitude (optional for reversibility)
-    sign_magnitude_to_twos(qc, a_reg, sign_a)
-    qc.cx(a_reg[n - 1], sign_a[0])
-    sign_magnitude_to_twos(qc, b_reg, sign_b)
-    qc.cx(b_reg[n - 1], sign_b[0])
+    qc.append(_sign_restore_gate(n), [sign_a[0], *a_reg])
+    qc.append(_sign_restore_gate(n), [sign_b[0], *b_reg])
 
     return qout, rem
 
@@ -630,26 +809,19 @@ def divi(qc, a_reg, divisor, n_output_bits=None):
     qout, rem = divui(qc, a_reg, abs(divisor), n_output_bits=n_output_bits)
 
     # Compute quotient sign
-    existing = {reg.name for reg in qc.qregs}
-    idx = 0
-    while f"signq{idx}" in existing:
-        idx += 1
-    sign_q = QuantumRegister(1, name=f"signq{idx}")
-    qc.add_register(sign_q)
+    sign_q = _fresh_register(qc, 1, "signq")
 
     if divisor < 0:
         qc.x(sign_q[0])
     qc.cx(sign_a[0], sign_q[0])
 
     # Convert back to two's complement
-    sign_magnitude_to_twos(qc, qout, sign_q)
-    qc.cx(qout[n_output_bits - 1], sign_q[0])
+    qc.append(_sign_restore_gate(n_output_bits), [sign_q[0], *qout])
 
     sign_magnitude_to_twos(qc, rem, sign_a)
 
     # Optionally restore input (for reversibility)
-    sign_magnitude_to_twos(qc, a_reg, sign_a)
-    qc.cx(a_reg[n - 1], sign_a[0])
+    qc.append(_sign_restore_gate(n), [sign_a[0], *a_reg])
 
     return qout, rem
 
@@ -664,18 +836,7 @@ def _controlled_addi_in_place(qc, qreg, value, control):
     """
 
     n = len(qreg)
-    qc.append(QFT(n, do_swaps=False), qreg)
-
-    b_bin = int_to_twos_complement(value)
-    b_int = int("".join(str(x) for x in b_bin[::-1]), 2)
-    b_val = b_int if value >= 0 else b_int - (1 << n)
-
-    for j in range(n):
-        angle = (b_val * 2 * np.pi) / (2 ** (j + 1))
-        if angle != 0:
-            qc.cp(angle, control, qreg[j])
-
-    qc.append(QFT(n, do_swaps=False).inverse(), qreg)
+    qc.append(_controlled_addi_gate(n, value % (1 << n)), [control, *qreg])
 
 
 def _sub_in_place(qc, a_reg, b_reg):
@@ -684,13 +845,7 @@ def _sub_in_place(qc, a_reg, b_reg):
     n = len(a_reg)
     assert len(b_reg) == n
 
-    qc.append(QFT(n, do_swaps=False), a_reg)
-    for i in range(n):
-        for j in range(n):
-            if j <= i:
-                angle = -(2 * np.pi) / (2 ** (i - j + 1))
-                qc.cp(angle, b_reg[j], a_reg[i])
-    qc.append(QFT(n, do_swaps=False).inverse(), a_reg)
+    qc.append(_add_gate(n, sign=-1), [*a_reg, *b_reg])
     return a_reg
 
 
@@ -700,23 +855,14 @@ def _controlled_add_in_place(qc, a_reg, b_reg, control):
     n = len(a_reg)
     assert len(b_reg) == n
 
-    qc.append(QFT(n, do_swaps=False), a_reg)
-    for i in range(n):
-        for j in range(n):
-            if j <= i:
-                angle = 2 * np.pi / (2 ** (i - j + 1))
-                gate = PhaseGate(angle).control(2)
-                qc.append(gate, [control, b_reg[j], a_reg[i]])
-    qc.append(QFT(n, do_swaps=False).inverse(), a_reg)
+    qc.append(_controlled_add_gate(n), [control, *a_reg, *b_reg])
     return a_reg
 
 
 def _controlled_invert_in_place(qc, qreg, control):
     """Negate ``qreg`` conditioned on ``control`` being ``|1>``."""
 
-    for qubit in qreg:
-        qc.cx(control, qubit)
-    _controlled_addi_in_place(qc, qreg, 1, control)
+    qc.append(_controlled_invert_gate(len(qreg)), [control, *qreg])
     return qreg
 
 
@@ -725,34 +871,25 @@ def equal(qc, a_reg, b_reg):
     a_pad = pad_register(qc, a_reg, n, "aeq")
     b_pad = pad_register(qc, b_reg, n, "beq")
 
-    existing = {reg.name for reg in qc.qregs}
-    xor_name = unique_reg_name(existing, "xor")
-    xor_reg = QuantumRegister(n, name=xor_name)
-    qc.add_register(xor_reg)
+    out = _fresh_register(qc, 1, "eq")
+    if a_pad == b_pad:
+        qc.x(out[0])
+        return out[0]
 
+    # Compute a XOR b into b in place (no scratch register), flip so every
+    # qubit is |1> iff the bits match, then restore b afterwards.
     for i in range(n):
-        qc.cx(a_pad[i], xor_reg[i])
-        qc.cx(b_pad[i], xor_reg[i])
-
-    eq_name = unique_reg_name(existing | {xor_name}, "eq")
-    out = QuantumRegister(1, name=eq_name)
-    qc.add_register(out)
-
-    for q in xor_reg:
-        qc.x(q)
-    qc.x(out[0])
-    qc.mcx(xor_reg, out[0])
-    qc.x(out[0])
-    for q in xor_reg:
-        qc.x(q)
+        qc.cx(a_pad[i], b_pad[i])
+        qc.x(b_pad[i])
+    qc.mcx(b_pad, out[0])
+    for i in range(n):
+        qc.x(b_pad[i])
+        qc.cx(a_pad[i], b_pad[i])
     return out[0]
 
 def not_equal(qc, a_reg, b_reg):
     eq = equal(qc, a_reg, b_reg)
-    existing = {reg.name for reg in qc.qregs}
-    neq_name = unique_reg_name(existing, "neq")
-    neq = QuantumRegister(1, name=neq_name)
-    qc.add_register(neq)
+    neq = _fresh_register(qc, 1, "neq")
     qc.x(neq[0])
     qc.cx(eq, neq[0])
     return neq[0]
@@ -762,22 +899,15 @@ def less_than(qc, a_reg, b_reg):
     a_pad = pad_register(qc, a_reg, n, "alt")
     b_pad = pad_register(qc, b_reg, n, "blt")
 
-    existing = {reg.name for reg in qc.qregs}
-    bneg_name = unique_reg_name(existing, "bneg")
-    tmp_b = QuantumRegister(n, name=bneg_name)
-    qc.add_register(tmp_b)
-    for i in range(n):
-        qc.cx(b_pad[i], tmp_b[i])
-    invert(qc, tmp_b)
-
-    diff = add(qc, a_pad, tmp_b)
+    out = _fresh_register(qc, 1, "lt")
+    if a_pad == b_pad:
+        return out[0]
 
-    lt_name = unique_reg_name({*existing, bneg_name}, "lt")
-    out = QuantumRegister(1, name=lt_name)
-    qc.add_register(out)
-    qc.cx(diff[n - 1], out[0])
-
-    invert(qc, tmp_b)
+    # a < b iff the sign bit of a - b is set.  Compute the difference in
+    # place, copy its sign bit and add b back to restore a.
+    _sub_in_place(qc, a_pad, b_pad)
+    qc.cx(a_pad[n - 1], out[0])
+    add_in_place(qc, a_pad, b_pad)
     return out[0]
 
 def greater_than(qc, a_reg, b_reg):
@@ -785,20 +915,14 @@ def greater_than(qc, a_reg, b_reg):
 
 def less_equal(qc, a_reg, b_reg):
     gt = greater_than(qc, a_reg, b_reg)
-    existing = {reg.name for reg in qc.qregs}
-    le_name = unique_reg_name(existing, "le")
-    le = QuantumRegister(1, name=le_name)
-    qc.add_register(le)
+    le = _fresh_register(qc, 1, "le")
     qc.x(le[0])
     qc.cx(gt, le[0])
     return le[0]
 
 def greater_equal(qc, a_reg, b_reg):
     lt = less_than(qc, a_reg, b_reg)
-    existing = {reg.name for reg in qc.qregs}
-    ge_name = unique_reg_name(existing, "ge")
-    ge = QuantumRegister(1, name=ge_name)
-    qc.add_register(ge)
+    ge = _fresh_register(qc, 1, "ge")
     qc.x(ge[0])
     qc.cx(lt, ge[0])
     return ge[0]
@@ -825,13 +949,8 @@ def initialize_bit(qc, value, name=None):
     if value not in (0, 1):
         raise ValueError("Bit value must be 0 or 1.")
 
-    existing = {reg.name for reg in qc.qregs}
-    idx = 0
     base_name = "qb" if name is None else name
-    while f"{base_name}{idx}" in existing:
-        idx += 1
-    reg = QuantumRegister(1, name=f"{base_name}{idx}")
-    qc.add_register(reg)
+    reg = _fresh_register(qc, 1, base_name)
 
     if value == 1:
         qc.x(reg[0])
@@ -854,10 +973,7 @@ def pad_register(qc, reg, target_size, name_hint="pad"):
     padded = list(reg)
     extra = target_size - len(reg)
     if extra > 0:
-        existing = {r.name for r in qc.qregs}
-        unique_name = unique_reg_name(existing, f"{name_hint}_ext")
-        pad_reg = QuantumRegister(extra, name=unique_name)
-        qc.add_register(pad_reg)
+        pad_reg = _fresh_register(qc, extra, f"{name_hint}_ext")
         padded += list(pad_reg)
     return padded
 
@@ -875,7 +991,7 @@ def measure(qc, qreg):
     qc.add_register(c_reg)
     qc.measure(qreg, c_reg)
 
-def simulate(qc, shots=1024):
+def simulate(qc, shots=1024, method="matrix_product_state", device="CPU", optimization_level=0):
     """
     Simulate the quantum circuit and print the interpreted two's complement value
     for each measured quantum register.
@@ -883,13 +999,26 @@ def simulate(qc, shots=1024):
     Args:
         qc (QuantumCircuit): The quantum circuit to simulate.
         shots (int): The number of shots for the simulation.
+        method (str): ``AerSimulator`` simulation method.  Matrix product
+            states are the default because compiled programs are usually far
+            wider than a dense statevector can hold; ``"statevector"`` is
+            faster for small, highly entangled arithmetic circuits.
+        device (str): ``AerSimulator`` device, e.g. ``"GPU"`` with
+            ``qiskit-aer-gpu`` installed.
+        optimization_level (int): Transpiler optimisation level.  The
+            default of 0 only inlines and translates gates, which is all a
+            simulator needs; higher levels are available for benchmarking.
     """
     if AerSimulator is not None:
-        backend = AerSimulator(method="matrix_product_state")
-        transpiled = qc
+        backend = AerSimulator(method=method, device=device)
     else:
         backend = BasicSimulator()
-        transpiled = transpile(qc, backend)
+    transpiled = transpile(
+        qc,
+        backend,
+        optimization_level=optimization_level,
+        translation_method="translator",
+    )
     job = backend.run(transpiled, shots=shots)
     counts = job.result().get_counts()
 
@@ -927,12 +1056,7 @@ def logical_and(qc, q1, q2):
     Returns:
         Qubit: Output qubit set to |1> iff q1 == 1 and q2 == 1
     """
-    existing = {reg.name for reg in qc.qregs}
-    idx = 0
-    while f"and{idx}" in existing:
-        idx += 1
-    and_reg = QuantumRegister(1, name=f"and{idx}")
-    qc.add_register(and_reg)
+    and_reg = _fresh_register(qc, 1, "and")
     qc.ccx(q1, q2, and_reg[0])
     return and_reg[0]
 
@@ -948,12 +1072,7 @@ def logical_or(qc, q1, q2):
     Returns:
         Qubit: Output qubit set to |1> iff q1 == 1 or q2 == 1
     """
-    existing = {reg.name for reg in qc.qregs}
-    idx = 0
-    while f"or{idx}" in existing:
-        idx += 1
-    or_reg = QuantumRegister(1, name=f"or{idx}")
-    qc.add_register(or_reg)
+    or_reg = _fresh_register(qc, 1, "or")
 
     qc.x(or_reg[0])        # initialize in |1>
     # Use De Morgan: q1 OR q2 = NOT (NOT q1 AND NOT q2)
@@ -1,18 +1,27 @@
 
+from functools import lru_cache
+
 from qiskit import QuantumCircuit, QuantumRegister
-from qiskit.circuit.library.standard_gates import PhaseGate
-from qiskit.circuit.library import QFT
+from qiskit.circuit.library.standard_gates import MCPhaseGate
+from . import q_arithmetics as _qa
 from .q_arithmetics import *
-from .q_arithmetics import _sub_in_place, _controlled_add_in_place
+from .q_arithmetics import (
+    _angle_pairs,
+    _compiled_gate,
+    _controlled_add_gate,
+    _controlled_invert_gate,
+    _controlled_invert_in_place,
+    _fresh_register,
+    _iqft_instr,
+    _phase_add_classical_controlled,
+    _phase_angle,
+    _qft_instr,
+    _restore_qubit_order,
+    _sub_in_place,
+    _controlled_add_in_place,
+)
 import numpy as np
 
-NUMBER_OF_BITS = 4
-
-def int_to_twos_complement(value):
-    if value < 0:
-        value = (1 << NUMBER_OF_BITS) + value
-    return [(value >> i) & 1 for i in range(NUMBER_OF_BITS)]
-
 
 def initialize_variable_controlled(qc, value, control, register_name=None):
     """
@@ -30,31 +39,26 @@ def initialize_variable_controlled(qc, value, control, register_name=None):
     Returns:
         QuantumRegister: The initialized register.
     """
-    MIN_VAL = -2**(NUMBER_OF_BITS - 1)
-    MAX_VAL = 2**(NUMBER_OF_BITS - 1) - 1
+    # Read the width from the module so set_number_of_bits() is honoured
+    n = _qa.NUMBER_OF_BITS
+    MIN_VAL = -2**(n - 1)
+    MAX_VAL = 2**(n - 1) - 1
     if value < MIN_VAL or value > MAX_VAL:
         raise ValueError(
-            f"Value {value} is out of range for two's complement with {NUMBER_OF_BITS} bits"
+            f"Value {value} is out of range for two's complement with {n} bits"
         )
 
-    if register_name is None:
-        base_name = "qr"
-        idx = 0
-        existing = {reg.name for reg in qc.qregs}
-        while f"{base_name}{idx}" in existing:
-            idx += 1
-        register_name = f"{base_name}{idx}"
-
     # Allocate the new quantum register
-    new_qreg = QuantumRegister(NUMBER_OF_BITS, name=register_name)
-    qc.add_register(new_qreg)
-
-    # Get the 2's complement representation
-    bits = int_to_twos_complement(value)
+    if register_name is None:
+        new_qreg = _fresh_register(qc, n, "qr")
+    else:
+        new_qreg = QuantumRegister(n, name=register_name)
+        qc.add_register(new_qreg)
 
-    # For each bit that's 1, apply a controlled X gate
-    for i, bit in enumerate(bits):
-        if bit == 1:
+    # For each bit set in the 2's complement pattern, apply a controlled X gate
+    bits = value & ((1 << n) - 1)
+    for i in range(n):
+        if (bits >> i) & 1:
             qc.cx(control, new_qreg[i])
 
     return new_qreg
@@ -64,39 +68,47 @@ def sign_magnitude_to_twos(qc, qreg, sign_reg, control=None):
     Convert a sign-magnitude encoded number to two's complement in-place.
     If control is provided, operation is conditional on control == 1.
     """
-    n = len(qreg)
-    for i in range(n):
-        if control is None:
-            qc.cx(sign_reg[0], qreg[i])
-        else:
-            qc.ccx(control, sign_reg[0], qreg[i])
     if control is None:
-        addi_in_place_controlled(qc, qreg, 1, sign_reg[0])
+        _controlled_invert_in_place(qc, qreg, sign_reg[0])
     else:
-        # AND(control, sign_reg[0]) → ancilla
-        existing = {reg.name for reg in qc.qregs}
-        idx = 0
-        while f"condtmp{idx}" in existing:
-            idx += 1
-        anc = QuantumRegister(1, name=f"condtmp{idx}")
-        qc.add_register(anc)
+        # AND(control, sign_reg[0]) → ancilla, negate, then reset anc to |0⟩
+        anc = _fresh_register(qc, 1, "condtmp")
+        qc.ccx(control, sign_reg[0], anc[0])
+        _controlled_invert_in_place(qc, qreg, anc[0])
         qc.ccx(control, sign_reg[0], anc[0])
-        addi_in_place_controlled(qc, qreg, 1, anc[0])
-        qc.cx(control, anc[0])  # uncompute
-        qc.cx(sign_reg[0], anc[0])
-        qc.ccx(control, sign_reg[0], anc[0])  # reset anc to |0⟩
+
+
+@lru_cache(maxsize=64)
+def _controlled_sign_restore_gate(n):
+    """Return the controlled divider sign fix-up on ``[control, sign, anc] + reg``.
+
+    Same as :func:`sign_magnitude_to_twos` with a control, followed by
+    clearing the sign flag from the result's MSB; ``anc`` is returned to
+    ``|0⟩``.
+    """
+    ctrl = QuantumRegister(1, "c")
+    sign = QuantumRegister(1, "s")
+    anc = QuantumRegister(1, "t")
+    reg = QuantumRegister(n, "r")
+    circ = QuantumCircuit(ctrl, sign, anc, reg, name=f"csignfix{n}")
+    circ.ccx(ctrl[0], sign[0], anc[0])
+    circ.append(_controlled_invert_gate(n), [anc[0], *reg])
+    circ.ccx(ctrl[0], sign[0], anc[0])
+    circ.ccx(ctrl[0], reg[n - 1], sign[0])
+    return _compiled_gate(circ)
+
+
+def _sign_restore_controlled(qc, qreg, sign_reg, control):
+    """Append :func:`_controlled_sign_restore_gate` with a fresh ancilla."""
+    anc = _fresh_register(qc, 1, "condtmp")
+    qc.append(_controlled_sign_restore_gate(len(qreg)), [control, sign_reg[0], anc[0], *qreg])
 
 def twos_to_sign_magnitude(qc, qreg):
     """
     Extract sign bit and prepare sign register.
     Returns: QuantumRegister with 1 qubit (sign bit copied)
     """
-    existing = {reg.name for reg in qc.qregs}
-    idx = 0
-    while f"signbit{idx}" in existing:
-        idx += 1
-    sign_reg = QuantumRegister(1, name=f"signbit{idx}")
-    qc.add_register(sign_reg)
+    sign_reg = _fresh_register(qc, 1, "signbit")
     qc.cx(qreg[-1], sign_reg[0])  # Copy sign bit
 
     for i in range(len(qreg)):
@@ -113,139 +125,144 @@ def _controlled_add_in_place(qc, a_reg, b_reg, external_control, control=None):
     If control is None, uses only external_control.
     """
     n = len(a_reg)
-    qc.append(QFT(n, do_swaps=False), a_reg)
+    qc.append(_qft_instr(n), a_reg)
 
-    for i in range(n):
-        for j in range(n):
-            if j <= i:
-                angle = 2 * np.pi / (2 ** (i - j + 1))
-                if control is None:
-                    qc.append(PhaseGate(angle).control(2), [external_control, b_reg[j], a_reg[i]])
-                else:
-                    qc.append(PhaseGate(angle).control(3), [control, external_control, b_reg[j], a_reg[i]])
-
-    qc.append(QFT(n, do_swaps=False).inverse(), a_reg)
+    for i, j, angle in _angle_pairs(n):
+        if control is None:
+            qc.append(_mcphase_gate(angle, 2), [external_control, b_reg[j], a_reg[i]])
+        else:
+            qc.append(_mcphase_gate(angle, 3), [control, external_control, b_reg[j], a_reg[i]])
+
+    qc.append(_iqft_instr(n), a_reg)
     return a_reg
 
 
+@lru_cache(maxsize=64)
+def _controlled_add_into_gate(n, b_sign=1):
+    """Return ``s += a + b`` (``s += a - b`` for ``b_sign=-1``) on qubits
+    ``[control] + a + b + s`` as one gate.
+
+    All controlled phases of the sweep commute, so the whole QFT sandwich is
+    built and compiled once per width and appended as a single instruction.
+    """
+    ctrl = QuantumRegister(1, "c")
+    a = QuantumRegister(n, "a")
+    b = QuantumRegister(n, "b")
+    s = QuantumRegister(n, "s")
+    name = f"cadd2_{n}" if b_sign == 1 else f"csub2_{n}"
+    circ = QuantumCircuit(ctrl, a, b, s, name=name)
+    circ.append(_qft_instr(n), s)
+    for i, j, angle in _angle_pairs(n):
+        circ.mcp(angle, [ctrl[0], a[j]], s[i])
+        circ.mcp(b_sign * angle, [ctrl[0], b[j]], s[i])
+    circ.append(_iqft_instr(n), s)
+    return _compiled_gate(circ)
+
+
+@lru_cache(maxsize=None)
+def _mcphase_gate(angle, num_ctrl):
+    """Return a shared ``num_ctrl``-controlled phase gate of ``angle``.
+
+    The multipliers reuse a handful of angles for O(n³) rotations, so each
+    distinct gate is built once instead of per ``.control()`` call.
+    """
+    return MCPhaseGate(angle, num_ctrl)
+
+
 def add_in_place_controlled(qc, a_reg, b_reg, control):
     n = len(a_reg)
-    qc.append(QFT(n, do_swaps=False), a_reg)
-    for i in range(n):
-        for j in range(n):
-            if j <= i:
-                angle = (2 * np.pi) / (2 ** (i - j + 1))
-                qc.append(PhaseGate(angle).control(2), [control, b_reg[j], a_reg[i]])
-    qc.append(QFT(n, do_swaps=False).inverse(), a_reg)
+    qc.append(_controlled_add_gate(n), [control, *a_reg, *b_reg])
     return a_reg
 
 def add_controlled(qc, a_reg, b_reg, control):
     n = len(a_reg)
-    existing_names = {reg.name for reg in qc.qregs}
-    idx = 0
-    while f"sum{idx}" in existing_names:
-        idx += 1
-    s_reg = QuantumRegister(n, name=f"sum{idx}")
-    qc.add_register(s_reg)
-    qc.append(QFT(n, do_swaps=False), s_reg)
-    for i in range(n):
-        for j in range(n):
-            if j <= i:
-                angle = 2 * np.pi / (2 ** (i - j + 1))
-                qc.append(PhaseGate(angle).control(2), [control, a_reg[j], s_reg[i]])
-                qc.append(PhaseGate(angle).control(2), [control, b_reg[j], s_reg[i]])
-    qc.append(QFT(n, do_swaps=False).inverse(), s_reg)
+    s_reg = _fresh_register(qc, n, "sum")
+    qc.append(_controlled_add_into_gate(n), [control, *a_reg, *b_reg, *s_reg])
     return s_reg
 
 def addi_in_place_controlled(qc, qreg, b, control):
     n = len(qreg)
-    b_bin = int_to_twos_complement(b)
-    b_int = int(''.join(str(x) for x in b_bin[::-1]), 2)
-    b_val = b_int if b >= 0 else b_int - (1 << n)
-    qc.append(QFT(n, do_swaps=False), qreg)
-    for j in range(n):
-        angle = (b_val * 2 * np.pi) / (2 ** (j + 1))
-        qc.cp(angle, control, qreg[j])
-    qc.append(QFT(n, do_swaps=False).inverse(), qreg)
+    # Phases only depend on b modulo 2**n
+    b_val = b & ((1 << n) - 1)
+    if b_val == 0:
+        return qreg
+    qc.append(_qft_instr(n), qreg)
+    _phase_add_classical_controlled(qc, qreg, b_val, control)
+    qc.append(_iqft_instr(n), qreg)
     return qreg
 
 def addi_controlled(qc, a_reg, b, control):
     n = len(a_reg)
-    existing = {reg.name for reg in qc.qregs}
-    idx = 0
-    while f"sum{idx}" in existing:
-        idx += 1
-    s_reg = QuantumRegister(n, name=f"sum{idx}")
-    qc.add_register(s_reg)
-    b_bin = int_to_twos_complement(b)
-    b_int = int(''.join(str(x) for x in b_bin[::-1]), 2)
-    b_val = b_int if b >= 0 else b_int - (1 << n)
-    qc.append(QFT(n, do_swaps=False), s_reg)
-    for j in range(n):
-        angle = (b_val * 2 * np.pi) / (2 ** (j + 1))
-        qc.cp(angle, control, s_reg[j])
-    for i in range(n):
-        for j in range(n):
-            if j <= i:
-                angle = 2 * np.pi / (2 ** (i - j + 1))
-                qc.append(PhaseGate(angle).control(2), [control, a_reg[j], s_reg[i]])
-    qc.append(QFT(n, do_swaps=False).inverse(), s_reg)
+    s_reg = _fresh_register(qc, n, "sum")
+    # Phases only depend on b modulo 2**n
+    b_val = b & ((1 << n) - 1)
+    qc.append(_qft_instr(n), s_reg)
+    _phase_add_classical_controlled(qc, s_reg, b_val, control)
+    for i, j, angle in _angle_pairs(n):
+        qc.append(_mcphase_gate(angle, 2), [control, a_reg[j], s_reg[i]])
+    qc.append(_iqft_instr(n), s_reg)
     return s_reg
 
 def invert_controlled(qc, qreg, control):
-    for qubit in qreg:
-        qc.cx(control, qubit)
-    addi_in_place_controlled(qc, qreg, 1, control)
-    return qreg
+    # The CX layer and the controlled +1 are one cached "cneg" gate
+    return _controlled_invert_in_place(qc, qreg, control)
 
 def sub_controlled(qc, a_reg, b_reg, control):
-    invert_controlled(qc, b_reg, control)
-    result = add_controlled(qc, a_reg, b_reg, control)
-    invert_controlled(qc, b_reg, control)
-    return result
+    # b is subtracted with negated phases, so it is never modified and needs
+    # no negation before (and restoration after) the addition.
+    n = len(a_reg)
+    s_reg = _fresh_register(qc, n, "sum")
+    qc.append(_controlled_add_into_gate(n, b_sign=-1), [control, *a_reg, *b_reg, *s_reg])
+    return s_reg
 
 def subi_controlled(qc, a_reg, b, control):
     return addi_controlled(qc, a_reg, -b, control)
 
 def mul_controlled(qc, a_reg, b_reg, control):
     n = len(a_reg)
-    existing = {reg.name for reg in qc.qregs}
-    idx = 0
-    while f"prod{idx}" in existing:
-        idx += 1
-    out_reg = QuantumRegister(n, name=f"prod{idx}")
-    qc.add_register(out_reg)
-    qc.append(QFT(n, do_swaps=False), out_reg)
+    out_reg = _fresh_register(qc, n, "prod")
+    qc.append(_qft_instr(n), out_reg)
     for j in range(1, n + 1):
         for i in range(1, n + 1):
             for k in range(1, n + 1):
-                lam = (2 * np.pi) / (2 ** (i + j + k - 2 * n))
-                if lam != 0:
-                    qc.append(PhaseGate(lam).control(3), [control, a_reg[n - j], b_reg[n - i], out_reg[k - 1]])
-    qc.append(QFT(n, do_swaps=False).inverse(), out_reg)
+                exponent = i + j + k - 2 * n
+                # exponent <= 0 gives a multiple of 2π, i.e. no rotation
+                if exponent > 0:
+                    gate = _mcphase_gate((2 * np.pi) / (2 ** exponent), 3)
+                    qc.append(gate, [control, a_reg[n - j], b_reg[n - i], out_reg[k - 1]])
+    qc.append(_iqft_instr(n), out_reg)
     return out_reg
 
 def muli_controlled(qc, a_reg, c, control, n_output_bits=None):
     n = len(a_reg)
     if n_output_bits is None:
         n_output_bits = n
-    existing = {reg.name for reg in qc.qregs}
-    idx = 0
-    while f"prod{idx}" in existing:
-        idx += 1
-    out_reg = QuantumRegister(n_output_bits, name=f"prod{idx}")
-    qc.add_register(out_reg)
-    qc.append(QFT(n_output_bits, do_swaps=False), out_reg)
-    abs_c = abs(c)
+    out_reg = _fresh_register(qc, n_output_bits, "prod")
+
+    # Same shortcuts as muli: 0 and ±2**k modulo 2**n_output_bits are an
+    # empty product or a controlled shifted copy (negated for -2**k).
+    modulus = 1 << n_output_bits
+    if c % modulus == 0:
+        return out_reg
+    for magnitude, negate in ((c % modulus, False), (-c % modulus, True)):
+        if magnitude & (magnitude - 1) == 0:
+            shift = magnitude.bit_length() - 1
+            for i in range(shift, min(n + shift, n_output_bits)):
+                qc.ccx(control, a_reg[i - shift], out_reg[i])
+            if negate:
+                invert_controlled(qc, out_reg, control)
+            return out_reg
+
+    qc.append(_qft_instr(n_output_bits), out_reg)
+    # A negative ``c`` is folded into the phases (reduced modulo 2**(k + 1)),
+    # which saves the second QFT sandwich a trailing negation would need.
     for j in range(n):
         for k in range(n_output_bits):
-            angle = (2 * np.pi * abs_c * (2 ** j)) / (2 ** (k + 1))
-            angle = angle % (2 * np.pi)
-            if angle != 0:
-                qc.append(PhaseGate(angle).control(2), [control, a_reg[j], out_reg[k]])
-    qc.append(QFT(n_output_bits, do_swaps=False).inverse(), out_reg)
-    if c < 0:
-        invert_controlled(qc, out_reg, control)
+            # Reduced exactly on integers, so identity rotations are skipped
+            angle = _phase_angle(c << j, k + 1)
+            if angle:
+                qc.append(_mcphase_gate(angle, 2), [control, a_reg[j], out_reg[k]])
+    qc.append(_iqft_instr(n_output_bits), out_reg)
     return out_reg
 
 def divu_controlled(qc, a_reg, b_reg, control, n_output_bits=None):
@@ -254,64 +271,61 @@ def divu_controlled(qc, a_reg, b_reg, control, n_output_bits=None):
     if n_output_bits is None:
         n_output_bits = n
 
-    existing = {reg.name for reg in qc.qregs}
-    idx = 0
-    while (
-        f"quotu{idx}" in existing or f"rem{idx}" in existing or f"sign{idx}" in existing
-    ):
-        idx += 1
-
-    qout = QuantumRegister(n_output_bits, name=f"quotu{idx}")
-    rem = QuantumRegister(n, name=f"rem{idx}")
-    sign = QuantumRegister(1, name=f"sign{idx}")
-    qc.add_register(qout)
-    qc.add_register(rem)
-    qc.add_register(sign)
+    qout = _fresh_register(qc, n_output_bits, "quotu")
+    rem = _fresh_register(qc, n, "rem")
+    sign = _fresh_register(qc, 1, "sign")
 
+    # As in divu, ``rem_q`` lists the qubit holding each remainder bit and the
+    # shift is a relabeling.  It need not be controlled: with control |0⟩
+    # every other step is skipped, so the remainder stays all zeros.
+    rem_q = list(rem)
     for i in reversed(range(n_output_bits)):
-        for j in reversed(range(1, n)):
-            qc.cswap(control, rem[j], rem[j - 1])
+        rem_q.insert(0, rem_q.pop())
         if i < n:
-            qc.cswap(control, rem[0], a_reg[i])
-        _sub_in_place(qc, rem, b_reg, control=control)
-        qc.ccx(control, rem[n - 1], sign[0])
-        _controlled_add_in_place(qc, rem, b_reg, sign[0], control=control)
+            qc.cswap(control, rem_q[0], a_reg[i])
+        _sub_in_place(qc, rem_q, b_reg, control=control)
+        qc.ccx(control, rem_q[n - 1], sign[0])
+        _controlled_add_in_place(qc, rem_q, b_reg, sign[0], control=control)
         qc.cx(control, qout[i])
         qc.ccx(control, sign[0], qout[i])
         qc.ccx(control, qout[i], sign[0])
         qc.cx(control, sign[0])
 
+    _restore_qubit_order(qc, rem, rem_q)
     return qout, rem
 
 
-def div_controlled(qc, a_reg, b_reg, control, n_output_bits=None):
+def div_controlled(qc, a_reg, b_reg, control, n_output_bits=None, a_is_nonneg=False, b_is_nonneg=False):
+    """Signed controlled division of ``a_reg`` by ``b_reg``.
+
+    ``a_is_nonneg`` / ``b_is_nonneg`` let the caller state that an operand is
+    known to be non-negative (e.g. a constant); its sign bit is then
+    classically zero and the sign/magnitude conversions for it are skipped.
+    """
     n = len(a_reg)
     if n_output_bits is None:
         n_output_bits = n
 
-    sign_a = twos_to_sign_magnitude(qc, a_reg)
-    sign_b = twos_to_sign_magnitude(qc, b_reg)
+    sign_a = None if a_is_nonneg else twos_to_sign_magnitude(qc, a_reg)
+    sign_b = None if b_is_nonneg else twos_to_sign_magnitude(qc, b_reg)
 
     qout, rem = divu_controlled(qc, a_reg, b_reg, control, n_output_bits=n_output_bits)
 
-    existing = {reg.name for reg in qc.qregs}
-    idx = 0
-    while f"signq{idx}" in existing:
-        idx += 1
+    if sign_a is not None or sign_b is not None:
+        sign_q = _fresh_register(qc, 1, "signq")
 
-    sign_q = QuantumRegister(1, name=f"signq{idx}")
-    qc.add_register(sign_q)
+        if sign_a is not None:
+            qc.ccx(control, sign_a[0], sign_q[0])
+        if sign_b is not None:
+            qc.ccx(control, sign_b[0], sign_q[0])
 
-    qc.ccx(control, sign_a[0], sign_q[0])
-    qc.ccx(control, sign_b[0], sign_q[0])
+        _sign_restore_controlled(qc, qout, sign_q, control)
 
-    sign_magnitude_to_twos(qc, qout, sign_q, control=control)
-    qc.ccx(control, qout[n_output_bits - 1], sign_q[0])
-    sign_magnitude_to_twos(qc, rem, sign_a, control=control)
-    sign_magnitude_to_twos(qc, a_reg, sign_a, control=control)
-    qc.ccx(control, a_reg[n - 1], sign_a[0])
-    sign_magnitude_to_twos(qc, b_reg, sign_b, control=control)
-    qc.ccx(control, b_reg[n - 1], sign_b[0])
+    if sign_a is not None:
+        sign_magnitude_to_twos(qc, rem, sign_a, control=control)
+        _sign_restore_controlled(qc, a_reg, sign_a, control)
+    if sign_b is not None:
+        _sign_restore_controlled(qc, b_reg, sign_b, control)
 
     return qout, rem
 
@@ -321,51 +335,57 @@ def _sub_in_place(qc, a_reg, b_reg, control=None):
     If control is provided, operation is done only if control == 1.
     """
     n = len(a_reg)
-    qc.append(QFT(n, do_swaps=False), a_reg)
+    qc.append(_qft_instr(n), a_reg)
 
-    for i in range(n):
-        for j in range(n):
-            if j <= i:
-                angle = -2 * np.pi / (2 ** (i - j + 1))
-                if control is None:
-                    qc.cp(angle, b_reg[j], a_reg[i])
-                else:
-                    qc.append(PhaseGate(angle).control(2), [control, b_reg[j], a_reg[i]])
-
-    qc.append(QFT(n, do_swaps=False).inverse(), a_reg)
+    for i, j, angle in _angle_pairs(n):
+        if control is None:
+            qc.cp(-angle, b_reg[j], a_reg[i])
+        else:
+            qc.append(_mcphase_gate(-angle, 2), [control, b_reg[j], a_reg[i]])
+
+    qc.append(_iqft_instr(n), a_reg)
     return a_reg
 
 
-def divi_controlled(qc, a_reg, divisor, control, n_output_bits=None):
+def divi_controlled(qc, a_reg, divisor, control, n_output_bits=None, a_is_nonneg=False):
+    """Signed controlled division of ``a_reg`` by the classical ``divisor``.
+
+    The divisor's sign is already classical; ``a_is_nonneg`` does the same for
+    a dividend known to be non-negative, as in :func:`div_controlled`.
+    """
     if divisor == 0:
         raise ValueError("Division by zero is not allowed.")
     n = len(a_reg)
+    magnitude = abs(divisor)
+    if magnitude >= 1 << n:
+        raise ValueError(f"Divisor {divisor} does not fit in {n} bits")
     if n_output_bits is None:
         n_output_bits = n
 
-    sign_a = twos_to_sign_magnitude(qc, a_reg)
+    sign_a = None if a_is_nonneg else twos_to_sign_magnitude(qc, a_reg)
 
-    b_reg = initialize_variable_controlled(qc, abs(divisor), control, "divi")
+    # The divisor magnitude is loaded into a fresh "divi<k>" register so that
+    # several divisions can share one circuit.
+    b_reg = _fresh_register(qc, n, "divi")
+    for i in range(n):
+        if (magnitude >> i) & 1:
+            qc.cx(control, b_reg[i])
 
     qout, rem = divu_controlled(qc, a_reg, b_reg, control, n_output_bits=n_output_bits)
 
-    existing = {reg.name for reg in qc.qregs}
-    idx = 0
-    while f"signq{idx}" in existing:
-        idx += 1
+    if sign_a is not None or divisor < 0:
+        sign_q = _fresh_register(qc, 1, "signq")
 
-    sign_q = QuantumRegister(1, name=f"signq{idx}")
-    qc.add_register(sign_q)
+        if divisor < 0:
+            qc.cx(control, sign_q[0])
+        if sign_a is not None:
+            qc.ccx(control, sign_a[0], sign_q[0])
 
-    if divisor < 0:
-        qc.cx(control, sign_q[0])
-    qc.ccx(control, sign_a[0], sign_q[0])
+        _sign_restore_controlled(qc, qout, sign_q, control)
 
-    sign_magnitude_to_twos(qc, qout, sign_q, control=control)
-    qc.ccx(control, qout[n_output_bits - 1], sign_q[0])
-    sign_magnitude_to_twos(qc, rem, sign_a, control=control)
-    sign_magnitude_to_twos(qc, a_reg, sign_a, control=control)
-    qc.ccx(control, a_reg[n - 1], sign_a[0])
+    if sign_a is not None:
+        sign_magnitude_to_twos(qc, rem, sign_a, control=control)
+        _sign_restore_controlled(qc, a_reg, sign_a, control)
 
     return qout, rem
 
@@ -36,31 +36,56 @@ from . import q_arithmetics as qa
 from . import q_arithmetics_controlled as qac
 
 
+def _wrap_signed(value: int, num_bits: int) -> int:
+    """Reduce ``value`` modulo ``2**num_bits`` into the signed range."""
+    half = 1 << (num_bits - 1)
+    return ((value + half) % (half << 1)) - half
+
+
+def _is_nonneg_constant(value, num_bits: int) -> bool:
+    """Return whether ``value`` is a (possibly controlled) non-negative init.
+
+    A controlled init holds either the constant or zero, so both kinds are
+    non-negative whenever the constant, wrapped to ``num_bits``, is.
+    """
+    owner = value.owner
+    return (
+        isinstance(owner, (QuantumInitOp, QuantumCInitOp))
+        and _wrap_signed(int(owner.value.value.data), num_bits) >= 0
+    )
+
+
 def generate_circuit(module: ModuleOp, num_bits: int = 16, verbose: bool = False) -> QuantumCircuit:
     """Convert ``module`` using the quantum dialect to a ``QuantumCircuit``."""
     qa.set_number_of_bits(num_bits)
     qc = QuantumCircuit()
     reg_map: Dict[object, object] = {}
 
-    def log_op(op, msg=None):
-        if verbose:
+    # Pick the logger once so quiet runs pay only for an empty call per op.
+    if verbose:
+        def log_op(op, msg=None):
             result = op.results[0] if op.results else "?"
             op_type = op.__class__.__name__
             operands = ", ".join(str(a) for a in op.operands)
             tail = f" -> {msg}" if msg else ""
             print(f"[{op_type}] {result} = {op.name}({operands}){tail}")
+    else:
+        def log_op(op, msg=None):
+            pass
 
     for func in module.ops:
         block = func.body.blocks[0]
         for op in block.ops:
             if isinstance(op, QuantumInitOp):
-                val = int(op.value.value.data)
+                # Constants are i32; the registers wrap at ``num_bits`` like the
+                # arithmetic on them does.
+                val = _wrap_signed(int(op.value.value.data), num_bits)
                 log_op(op, f"init {val}")
                 reg = qa.initialize_variable(qc, val)
                 reg_map[op.results[0]] = reg
 
             elif isinstance(op, QuantumCInitOp):
-                val = int(op.value.value.data)
+                val = _wrap_signed(int(op.value.value.data), num_bits)
                 ctrl = reg_map[op.ctrl]
                 log_op(op, f"c_init {val} controlled by {op.ctrl}")
                 reg = qac.initialize_variable_controlled(qc, val, ctrl)
@@ -107,7 +132,14 @@ def generate_circuit(module: ModuleOp, num_bits: int = 16, verbose: bool = False
                 reg_map[op.results[0]] = qac.mul_controlled(qc, reg_map[op.lhs], reg_map[op.rhs], reg_map[op.ctrl])
             elif isinstance(op, CQDivSOp):
                 log_op(op, "c_div")
-                reg_map[op.results[0]], _ = qac.div_controlled(qc, reg_map[op.lhs], reg_map[op.rhs], reg_map[op.ctrl])
+                reg_map[op.results[0]], _ = qac.div_controlled(
+                    qc,
+                    reg_map[op.lhs],
+                    reg_map[op.rhs],
+                    reg_map[op.ctrl],
+                    a_is_nonneg=_is_nonneg_constant(op.lhs, num_bits),
+                    b_is_nonneg=_is_nonneg_constant(op.rhs, num_bits),
+                )
 
             elif isinstance(op, CQAddiImmOp):
                 imm = int(op.imm.value.data)
@@ -124,7 +156,9 @@ def generate_circuit(module: ModuleOp, num_bits: int = 16, verbose: bool = False
             elif isinstance(op, CQDivSImmOp):
                 imm = int(op.imm.value.data)
                 log_op(op, f"c_divi_imm {imm}")
-                reg_map[op.results[0]], _ = qac.divi_controlled(qc, reg_map[op.lhs], imm, reg_map[op.ctrl])
+                reg_map[op.results[0]], _ = qac.divi_controlled(
+                    qc, reg_map[op.lhs], imm, reg_map[op.ctrl], a_is_nonneg=_is_nonneg_constant(op.lhs, num_bits)
+                )
 
             elif isinstance(op, QCmpiOp):
                 lhs = reg_map[op.lhs]
@@ -0,0 +1,130 @@
+"""Regression tests for parsing clang JSON into the ``c_ast`` dataclasses."""
+
+import pytest
+
+from step2_ast_to_dataclasses.c_ast import (
+    BinaryOperator,
+    BinaryOperatorWithImmediate,
+    DeclRef,
+    IntegerLiteral,
+    parse_ast,
+)
+from step3_dataclasses_to_mlir.mlir_generator import MLIRGenerator
+
+
+def _lit(value):
+    return {"kind": "IntegerLiteral", "value": str(value)}
+
+
+def _ref(name):
+    return {
+        "kind": "ImplicitCastExpr",
+        "inner": [{"kind": "DeclRefExpr", "referencedDecl": {"name": name}}],
+    }
+
+
+def _binop(opcode, lhs, rhs):
+    return {"kind": "BinaryOperator", "opcode": opcode, "inner": [lhs, rhs]}
+
+
+def _neg(operand):
+    return {"kind": "UnaryOperator", "opcode": "-", "inner": [operand]}
+
+
+def _paren(expr):
+    return {"kind": "ParenExpr", "inner": [expr]}
+
+
+def _main_returning(expr):
+    """Clang JSON for ``int main() { int x = 7; return <expr>; }``."""
+    return {
+        "kind": "TranslationUnitDecl",
+        "inner": [{
+            "kind": "FunctionDecl",
+            "name": "main",
+            "inner": [{
+                "kind": "CompoundStmt",
+                "inner": [
+                    {"kind": "DeclStmt", "inner": [
+                        {"kind": "VarDecl", "name": "x", "inner": [_lit(7)]},
+                    ]},
+                    {"kind": "ReturnStmt", "inner": [expr]},
+                ],
+            }],
+        }],
+    }
+
+
+# Literal-on-the-left expressions whose operator is not commutative.
+NON_COMMUTATIVE_LHS_LITERALS = {
+    "-5 - x": (_binop("-", _neg(_lit(5)), _ref("x")), "-", -5),
+    "(1+2) < x": (_binop("<", _paren(_binop("+", _lit(1), _lit(2))), _ref("x")), "<", 3),
+    "-1 / x": (_binop("/", _neg(_lit(1)), _ref("x")), "/", -1),
+}
+
+
+@pytest.mark.parametrize("source", sorted(NON_COMMUTATIVE_LHS_LITERALS))
+def test_non_commutative_lhs_literal_stays_generic_and_lowers(source):
+    expr_json, opcode, value = NON_COMMUTATIVE_LHS_LITERALS[source]
+    func = parse_ast(_main_returning(expr_json)).decls[0]
+
+    ret = func.body.stmts[-1].value
+    assert type(ret) is BinaryOperator
+    assert ret.opcode == opcode
+    assert ret.lhs == IntegerLiteral(value)
+    assert ret.rhs == DeclRef("x")
+
+    MLIRGenerator().generate_function(func)
+
+
+def test_commutative_lhs_literal_uses_immediate_form():
+    func = parse_ast(_main_returning(_binop("*", _lit(3), _ref("x")))).decls[0]
+
+    ret = func.body.stmts[-1].value
+    assert type(ret) is BinaryOperatorWithImmediate
+    assert "muli_imm" in str(MLIRGenerator().generate_function(func))
+
+
+def _main_with_a(init_json):
+    """Clang JSON for ``int main() { int a = <init>; return a; }``."""
+    return {
+        "kind": "TranslationUnitDecl",
+        "inner": [{
+            "kind": "FunctionDecl",
+            "name": "main",
+            "inner": [{
+                "kind": "CompoundStmt",
+                "inner": [
+                    {"kind": "DeclStmt", "inner": [
+                        {"kind": "VarDecl", "name": "a", "inner": [init_json]},
+                    ]},
+                    {"kind": "ReturnStmt", "inner": [_ref("a")]},
+                ],
+            }],
+        }],
+    }
+
+
+def test_folded_literal_wraps_to_i32():
+    func = parse_ast(_main_with_a(_binop("*", _lit(100000), _lit(100000)))).decls[0]
+
+    # 100000 * 100000 == 10000000000 == 1410065408 (mod 2**32)
+    assert func.body.stmts[0].init == IntegerLiteral(1410065408)
+    MLIRGenerator().generate_function(func)
+
+
+def test_folded_literal_wraps_to_register_width():
+    from qiskit.providers.basic_provider import BasicSimulator
+    from xdsl.dialects.builtin import ModuleOp
+
+    from step4_mlir_to_quantum_mlir.quantum_mlir_generator import generate_quantum_mlir
+    from step5_quantum_mlir_to_qasm.qasm_generator import generate_circuit
+
+    func = parse_ast(_main_with_a(_binop("*", _lit(100), _lit(100)))).decls[0]
+    module = ModuleOp([MLIRGenerator().generate_function(func)])
+    circuit = generate_circuit(generate_quantum_mlir(module), num_bits=8)
+
+    counts = BasicSimulator().run(circuit, shots=1).result().get_counts()
+    (bits,) = counts
+    # 100 * 100 == 10000 == 16 (mod 2**8), as the quantum multiply would give.
+    assert int(bits.replace(" ", ""), 2) == 16